@@ -0,0 +1,186 @@
+"""
+E-commerce inventory (Question 7) for many concurrent writers.
+
+update_inventory is the original single-item rule and stays the
+reference. Inventory applies batches of stock changes atomically: either
+every change in a batch is applied or none is, and stock never goes
+negative. Items are spread over lock stripes, so writers touching
+different items rarely wait for each other, and every call returns an
+InventoryResult instead of printing.
+
+Max/min stock queries use two heaps per stripe with lazy deletion:
+every change pushes the item's new level onto its stripe's heaps, and
+entries that no longer match the current stock are dropped when they
+reach the top. The heaps are guarded by the stripe locks writers already
+hold, so writers never share a lock. Updates are O(log n) and queries
+compare one top per stripe instead of scanning every item.
+"""
+import heapq
+import itertools
+import threading
+from collections import namedtuple
+
+N_STRIPES = 16
+
+# ok: whether the whole call was applied
+# stock: new (or, on failure, current) stock of the items involved
+# errors: one message per rejected change
+InventoryResult = namedtuple("InventoryResult", ["ok", "stock", "errors"])
+
+
+def update_inventory(inv, item, qty):
+    if item not in inv:
+        print("Item not found")
+    else:
+        if inv[item] + qty < 0:
+            print("Not enough stock for", item)
+        else:
+            inv[item] += qty
+    return inv
+
+
+class Inventory:
+    """Thread-safe stock levels with atomic batches and O(log n) max/min."""
+
+    def __init__(self, stock=None, n_stripes=N_STRIPES):
+        self._stock = {}
+        self._order = {}                    # item -> insertion rank, breaks max/min ties
+        self._counter = itertools.count()
+        self._stripes = [threading.Lock() for _ in range(n_stripes)]
+        # Only new items take this, to draw their rank
+        self._rank_lock = threading.Lock()
+        # Per stripe, guarded by its lock like the stock of its items
+        self._max_heaps = [[] for _ in range(n_stripes)]   # (-stock, rank, item)
+        self._min_heaps = [[] for _ in range(n_stripes)]   # (stock, rank, item)
+        self._sizes = [0] * n_stripes
+        for item, qty in (stock or {}).items():
+            self.add_item(item, qty)
+
+    def _stripe(self, item):
+        return hash(item) % len(self._stripes)
+
+    def _acquire(self, stripes):
+        # Always in increasing index order, so writers cannot deadlock
+        for stripe in stripes:
+            self._stripes[stripe].acquire()
+        return stripes
+
+    def _locked(self, items):
+        """Acquire the stripes of items and return them for _release."""
+        return self._acquire(sorted({self._stripe(item) for item in items}))
+
+    def _release(self, stripes):
+        for stripe in reversed(stripes):
+            self._stripes[stripe].release()
+
+    def _set(self, item, qty):
+        # Caller holds the item's stripe
+        stripe = self._stripe(item)
+        self._stock[item] = qty
+        rank = self._order[item]
+        heapq.heappush(self._max_heaps[stripe], (-qty, rank, item))
+        heapq.heappush(self._min_heaps[stripe], (qty, rank, item))
+        self._compact(stripe)
+
+    def add_item(self, item, qty=0):
+        """Add a new item; returns a failed result if it exists or qty is negative."""
+        stripes = self._locked([item])
+        try:
+            if item in self._stock:
+                return InventoryResult(False, {item: self._stock[item]},
+                                       [f"Item already exists: {item}"])
+            if qty < 0:
+                return InventoryResult(False, {}, [f"Negative stock for {item}"])
+            with self._rank_lock:
+                self._order[item] = next(self._counter)
+            self._sizes[self._stripe(item)] += 1
+            self._set(item, qty)
+            return InventoryResult(True, {item: qty}, [])
+        finally:
+            self._release(stripes)
+
+    def update(self, item, qty):
+        """Change one item's stock by qty (negative to remove)."""
+        return self.apply_batch([(item, qty)])
+
+    def apply_batch(self, transactions):
+        """Apply (item, qty) changes all-or-nothing.
+
+        Changes to the same item are summed first, so a batch may remove
+        stock that an earlier change in the same batch added.
+        """
+        deltas = {}
+        for item, qty in transactions:
+            deltas[item] = deltas.get(item, 0) + qty
+
+        stripes = self._locked(deltas)
+        try:
+            stock, errors = {}, []
+            for item, delta in deltas.items():
+                if item not in self._stock:
+                    errors.append(f"Item not found: {item}")
+                    continue
+                stock[item] = self._stock[item] + delta
+                if stock[item] < 0:
+                    errors.append(f"Not enough stock for {item}")
+            if errors:
+                current = {item: self._stock[item] for item in deltas if item in self._stock}
+                return InventoryResult(False, current, errors)
+            for item, qty in stock.items():
+                if deltas[item]:
+                    self._set(item, qty)
+            return InventoryResult(True, stock, [])
+        finally:
+            self._release(stripes)
+
+    def get(self, item, default=None):
+        return self._stock.get(item, default)
+
+    def __len__(self):
+        return len(self._stock)
+
+    def snapshot(self):
+        """Consistent copy of all stock levels (blocks writers while copying)."""
+        stripes = self._acquire(range(len(self._stripes)))
+        try:
+            return dict(self._stock)
+        finally:
+            self._release(stripes)
+
+    def _top(self, heap, sign):
+        # Drop entries whose level is no longer the item's current stock
+        while heap:
+            level, _, item = heap[0]
+            if self._stock.get(item) == sign * level:
+                return item, sign * level
+            heapq.heappop(heap)
+        return None
+
+    def _compact(self, stripe):
+        # Rebuild when stale entries outnumber live ones, so the heaps stay O(n)
+        max_heap, min_heap = self._max_heaps[stripe], self._min_heaps[stripe]
+        if len(max_heap) + len(min_heap) > 4 * self._sizes[stripe] + 16:
+            items = {item for _, _, item in max_heap}
+            max_heap[:] = [(-self._stock[item], self._order[item], item) for item in items]
+            min_heap[:] = [(self._stock[item], self._order[item], item) for item in items]
+            heapq.heapify(max_heap)
+            heapq.heapify(min_heap)
+
+    def _best(self, heaps, sign):
+        # Holds every stripe, so the answer is one consistent state
+        stripes = self._acquire(range(len(self._stripes)))
+        try:
+            tops = [top for top in (self._top(heap, sign) for heap in heaps) if top is not None]
+        finally:
+            self._release(stripes)
+        if not tops:
+            return None
+        return min(tops, key=lambda top: (sign * top[1], self._order[top[0]]))
+
+    def max_item(self):
+        """(item, stock) with the most stock, earliest added on ties; None if empty."""
+        return self._best(self._max_heaps, -1)
+
+    def min_item(self):
+        """(item, stock) with the least stock, earliest added on ties; None if empty."""
+        return self._best(self._min_heaps, 1)
@@ -0,0 +1,180 @@
+"""
+Sales analytics (Question 6) over a continuous feed.
+
+analyze_sales is the original function and stays the reference: it
+needs the whole list and does three passes (the median sorts).
+SalesAnalytics ingests values one at a time or in batches and answers
+the same (highest, lowest, median) for the whole history and for a
+sliding window of the last `window` values:
+
+- history: running max/min, and the median from two heaps (lower half in
+  a max-heap, upper half in a min-heap), O(log n) per value. An exact
+  median still has to keep every value.
+- window: monotonic deques for max/min (O(1) amortized), and two heaps
+  with lazy deletion for the median: values leaving the window are only
+  counted, and removed when they reach a heap top, O(log n) per value.
+
+Medians use the same expression as statistics.median, so results are
+exactly equal to analyze_sales on the same values.
+"""
+import heapq
+import statistics
+from collections import deque
+
+
+def analyze_sales(sales_list):
+    high = max(sales_list)
+    low = min(sales_list)
+    mid = statistics.median(sales_list)
+    return high, low, mid
+
+
+class _RunningMedian:
+    """Median of a multiset, with lazy removal of values."""
+
+    def __init__(self):
+        self.low = []        # max-heap of the lower half (negated values)
+        self.high = []       # min-heap of the upper half
+        self.n_low = 0       # live sizes, excluding values waiting for removal
+        self.n_high = 0
+        # value -> copies still to drop, per heap
+        self.removed_low = {}
+        self.removed_high = {}
+
+    @staticmethod
+    def _prune(heap, sign, removed):
+        # Drop removed values sitting on top of heap
+        while heap:
+            value = sign * heap[0]
+            if not removed.get(value):
+                return
+            removed[value] -= 1
+            heapq.heappop(heap)
+
+    def _balance(self):
+        # Keep n_low == n_high or n_low == n_high + 1
+        if self.n_low > self.n_high + 1:
+            heapq.heappush(self.high, -heapq.heappop(self.low))
+            self.n_low -= 1
+            self.n_high += 1
+            self._prune(self.low, -1, self.removed_low)
+        elif self.n_low < self.n_high:
+            heapq.heappush(self.low, -heapq.heappop(self.high))
+            self.n_low += 1
+            self.n_high -= 1
+            self._prune(self.high, 1, self.removed_high)
+
+    def _compact(self):
+        # Removed values below the tops never surface (e.g. a rising feed);
+        # rebuild once they outnumber live ones, so memory stays O(live)
+        if len(self.low) + len(self.high) <= 2 * len(self) + 64:
+            return
+        for name, sign, removed in (('low', -1, self.removed_low),
+                                    ('high', 1, self.removed_high)):
+            kept = []
+            for item in getattr(self, name):
+                if removed.get(sign * item):
+                    removed[sign * item] -= 1
+                else:
+                    kept.append(item)
+            heapq.heapify(kept)
+            setattr(self, name, kept)
+        self.removed_low, self.removed_high = {}, {}
+
+    def add(self, value):
+        if not self.low or value <= -self.low[0]:
+            heapq.heappush(self.low, -value)
+            self.n_low += 1
+        else:
+            heapq.heappush(self.high, value)
+            self.n_high += 1
+        self._balance()
+
+    def remove(self, value):
+        """Remove one copy of a value that was added earlier."""
+        # Every low value is <= every high value, so value <= low top means it is in low
+        if value <= -self.low[0]:
+            self.removed_low[value] = self.removed_low.get(value, 0) + 1
+            self.n_low -= 1
+            self._prune(self.low, -1, self.removed_low)
+        else:
+            self.removed_high[value] = self.removed_high.get(value, 0) + 1
+            self.n_high -= 1
+            self._prune(self.high, 1, self.removed_high)
+        self._balance()
+        self._compact()
+
+    def __len__(self):
+        return self.n_low + self.n_high
+
+    def median(self):
+        if len(self) == 0:
+            raise ValueError("no sales yet")
+        if self.n_low > self.n_high:
+            return -self.low[0]
+        # Same expression as statistics.median for an even count
+        return (-self.low[0] + self.high[0]) / 2
+
+
+class SalesAnalytics:
+    """Incremental (highest, lowest, median) over all sales and the last `window`."""
+
+    def __init__(self, window=None):
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.count = 0
+        self._high = self._low = None
+        self._median = _RunningMedian()
+        # Window state: its values in order, (index, value) deques and its own median
+        self._values = deque()
+        self._max_deque = deque()
+        self._min_deque = deque()
+        self._window_median = _RunningMedian()
+
+    def add(self, value):
+        """Ingest one sale."""
+        # Strict comparisons keep the earliest of equal values, like max()/min()
+        if self.count == 0 or value > self._high:
+            self._high = value
+        if self.count == 0 or value < self._low:
+            self._low = value
+        self._median.add(value)
+
+        if self.window is not None:
+            index = self.count
+            self._values.append(value)
+            self._window_median.add(value)
+            if len(self._values) > self.window:
+                self._window_median.remove(self._values.popleft())
+            while self._max_deque and self._max_deque[-1][1] < value:
+                self._max_deque.pop()
+            self._max_deque.append((index, value))
+            while self._min_deque and self._min_deque[-1][1] > value:
+                self._min_deque.pop()
+            self._min_deque.append((index, value))
+            oldest = index - self.window + 1
+            if self._max_deque[0][0] < oldest:
+                self._max_deque.popleft()
+            if self._min_deque[0][0] < oldest:
+                self._min_deque.popleft()
+        self.count += 1
+
+    def extend(self, values):
+        """Ingest a batch of sales in order."""
+        for value in values:
+            self.add(value)
+
+    def stats(self):
+        """(highest, lowest, median) of every sale so far, as analyze_sales."""
+        if self.count == 0:
+            raise ValueError("no sales yet")
+        return self._high, self._low, self._median.median()
+
+    def window_stats(self):
+        """(highest, lowest, median) of the last `window` sales."""
+        if self.window is None:
+            raise ValueError("SalesAnalytics was created without a window")
+        if self.count == 0:
+            raise ValueError("no sales yet")
+        return self._max_deque[0][1], self._min_deque[0][1], self._window_median.median()
@@ -0,0 +1,89 @@
+import contextlib
+import io
+import random
+import threading
+
+from inventory import Inventory, update_inventory
+
+START = {"pen": 10, "book": 8, "bag": 5, "marker": 12, "register": 6}
+
+
+def test_matches_update_inventory():
+    """Single updates give the same stock and max/min as the original dict code."""
+    print("🧪 Testing Inventory against update_inventory")
+    rng = random.Random(0)
+    reference = dict(START)
+    inv = Inventory(START)
+    items = list(START) + ["stapler"]
+    for _ in range(5000):
+        item, qty = rng.choice(items), rng.randint(-6, 6)
+        with contextlib.redirect_stdout(io.StringIO()) as printed:
+            update_inventory(reference, item, qty)
+        result = inv.update(item, qty)
+        assert result.ok == (printed.getvalue() == ""), (item, qty, result)
+        assert inv.snapshot() == reference
+        top = max(reference, key=reference.get)
+        bottom = min(reference, key=reference.get)
+        assert inv.max_item() == (top, reference[top])
+        assert inv.min_item() == (bottom, reference[bottom])
+    print("✅ 5000 random updates match, including max/min ties")
+
+
+def test_batches_are_atomic():
+    print("🧪 Testing all-or-nothing batches")
+    inv = Inventory(START)
+    result = inv.apply_batch([("pen", -3), ("bag", -6), ("stapler", 1)])
+    assert not result.ok
+    assert result.errors == ["Not enough stock for bag", "Item not found: stapler"]
+    assert inv.snapshot() == START
+
+    # Changes to one item are combined: add 5 bags, then take 9
+    result = inv.apply_batch([("bag", 5), ("pen", -3), ("bag", -9)])
+    assert result.ok and result.stock == {"bag": 1, "pen": 7}
+    assert inv.min_item() == ("bag", 1) and inv.max_item() == ("marker", 12)
+    print("Rejected:", ["Not enough stock for bag", "Item not found: stapler"])
+    print("✅ Failed batches change nothing; successful ones apply every change")
+
+
+def test_concurrent_writers():
+    """Parallel random batches never lose an update or go negative."""
+    print("🧪 Testing concurrent batches")
+    items = [f"sku{i}" for i in range(200)]
+    inv = Inventory({item: 50 for item in items}, n_stripes=8)
+    applied = []
+    lock = threading.Lock()
+
+    def writer(seed):
+        rng = random.Random(seed)
+        mine = []
+        for _ in range(2000):
+            batch = [(rng.choice(items), rng.randint(-5, 4)) for _ in range(rng.randint(1, 4))]
+            if inv.apply_batch(batch).ok:
+                mine.extend(batch)
+        with lock:
+            applied.extend(mine)
+
+    threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = {item: 50 for item in items}
+    for item, qty in applied:
+        expected[item] += qty
+    stock = inv.snapshot()
+    assert stock == expected
+    assert min(stock.values()) >= 0
+    top = max(stock, key=stock.get)
+    bottom = min(stock, key=stock.get)
+    assert inv.max_item() == (top, stock[top]) and inv.min_item() == (bottom, stock[bottom])
+    print(f"Applied {len(applied)} changes from 8 threads")
+    print("✅ Stock matches the applied changes and never went negative")
+
+
+if __name__ == "__main__":
+    test_matches_update_inventory()
+    test_batches_are_atomic()
+    test_concurrent_writers()
+    print("\n✅ All inventory tests passed!")
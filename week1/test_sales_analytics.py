@@ -0,0 +1,67 @@
+import random
+
+from sales_analytics import SalesAnalytics, analyze_sales
+
+
+def random_sales(rng, n):
+    """Floats, ints and many duplicates, like a real feed of rounded amounts."""
+    kind = rng.choice(["float", "int", "few"])
+    if kind == "float":
+        return [round(rng.uniform(0, 1000), 2) for _ in range(n)]
+    if kind == "int":
+        return [rng.randint(-50, 50) for _ in range(n)]
+    return [rng.choice([1.5, 2.0, 2.5, 10.0]) for _ in range(n)]
+
+
+def test_history_matches_analyze_sales():
+    print("🧪 Testing whole-history stats against analyze_sales")
+    rng = random.Random(0)
+    for _ in range(200):
+        sales = random_sales(rng, rng.randint(1, 300))
+        analytics = SalesAnalytics()
+        for i, value in enumerate(sales):
+            analytics.add(value)
+            assert analytics.stats() == analyze_sales(sales[:i + 1])
+    print("✅ Every prefix of 200 random feeds matches exactly")
+
+
+def test_window_matches_analyze_sales():
+    print("🧪 Testing sliding-window stats against analyze_sales")
+    rng = random.Random(1)
+    for _ in range(200):
+        window = rng.randint(1, 40)
+        sales = random_sales(rng, rng.randint(1, 300))
+        analytics = SalesAnalytics(window=window)
+        for i, value in enumerate(sales):
+            analytics.add(value)
+            expected = analyze_sales(sales[max(0, i + 1 - window):i + 1])
+            assert analytics.window_stats() == expected, (window, i, analytics.window_stats(), expected)
+    print("✅ Every window of 200 random feeds matches exactly")
+
+
+def test_batches_and_errors():
+    print("🧪 Testing batch ingestion and empty analytics")
+    sales = [120.0, 95.5, 130.25, 80.0, 101.0, 99.99, 150.0]
+    analytics = SalesAnalytics(window=5)
+    analytics.extend(sales[:3])
+    analytics.extend(sales[3:])
+    assert analytics.stats() == analyze_sales(sales)
+    assert analytics.window_stats() == analyze_sales(sales[-5:])
+    print("History:", analytics.stats(), "Window:", analytics.window_stats())
+
+    for call in (SalesAnalytics().stats, SalesAnalytics(3).window_stats,
+                 SalesAnalytics().window_stats):
+        try:
+            call()
+        except ValueError as e:
+            print("Caught:", e)
+        else:
+            raise AssertionError("expected ValueError")
+    print("✅ Batches match and empty analytics raise ValueError")
+
+
+if __name__ == "__main__":
+    test_history_matches_analyze_sales()
+    test_window_matches_analyze_sales()
+    test_batches_and_errors()
+    print("\n✅ All sales analytics tests passed!")
@@ -0,0 +1,93 @@
+import csv
+import math
+import os
+import tempfile
+
+import numpy as np
+
+from ticket_pricing import (calc_price, price_batch, price_file, random_customers,
+                            summarize_prices)
+
+
+def reference_summary(ages, students, weekends):
+    """The original Question 4 summary: scalar prices, then total/max/min passes."""
+    prices = [calc_price(int(a), bool(s), bool(w)) for a, s, w in zip(ages, students, weekends)]
+    total = sum(prices)
+    if len(prices) >= 4:
+        total *= 0.9
+    return total, max(prices), min(prices)
+
+
+def test_prices_match_calc_price():
+    """Every (age, student, weekend) combination gets exactly the scalar price."""
+    print("🧪 Testing price_batch against calc_price")
+    ages = np.repeat(np.arange(0, 121), 4)
+    students = np.tile([False, True, False, True], 121)
+    weekends = np.tile([False, False, True, True], 121)
+    expected = [calc_price(int(a), s, w) for a, s, w in zip(ages, students, weekends)]
+    assert price_batch(ages, students, weekends).tolist() == expected
+
+    # Fractional ages hit the same bracket edges
+    ages = np.array([11.5, 12.0, 12.5, 17.5, 59.5, 120.0])
+    expected = [calc_price(a, True, False) for a in ages]
+    assert price_batch(ages, np.ones(6, bool), np.zeros(6, bool)).tolist() == expected
+    print("✅ All 484 combinations and fractional ages match")
+
+
+def test_invalid_age():
+    print("🧪 Testing invalid ages")
+    for bad in (-1, 121, float("nan"), float("inf")):
+        try:
+            price_batch([30, bad], [False, False], [False, False])
+        except ValueError as e:
+            print("Caught:", e)
+        else:
+            raise AssertionError(f"age {bad} was accepted")
+    print("✅ Invalid ages raise ValueError")
+
+
+def test_summary_matches_reference():
+    """Total, highest and lowest match the original loop, for any chunking."""
+    print("🧪 Testing summarize_prices against the scalar summary")
+    for n in (1, 3, 4, 1000, 200_000):
+        ages, students, weekends = random_customers(n, seed=n)
+        total, highest, lowest = reference_summary(ages, students, weekends)
+        for chunk in (1_000_000, 997, 7):
+            if n // chunk > 10_000:
+                continue
+            summary = summarize_prices(
+                price_batch(ages[i:i + chunk], students[i:i + chunk], weekends[i:i + chunk])
+                for i in range(0, n, chunk))
+            assert summary["count"] == n
+            assert summary["highest"] == highest and summary["lowest"] == lowest
+            # The scalar sum of floats drifts slightly; the batch total is exact
+            assert math.isclose(summary["total"], total, rel_tol=1e-12), (summary["total"], total)
+        print(f"n={n}: total {round(total, 2)}, highest {highest}, lowest {lowest}")
+    print("✅ Summaries match")
+
+
+def test_price_file():
+    print("🧪 Testing price_file")
+    ages, students, weekends = random_customers(2500, seed=7)
+    yes_no = {True: "yes", False: "no"}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "customers.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["age", "student", "weekend"])
+            for a, s, w in zip(ages, students, weekends):
+                writer.writerow([a, yes_no[bool(s)], "1" if w else "0"])
+        summary = price_file(path, chunk_size=1000)
+    total, highest, lowest = reference_summary(ages, students, weekends)
+    assert summary["count"] == 2500
+    assert math.isclose(summary["total"], total, rel_tol=1e-12)
+    assert (summary["highest"], summary["lowest"]) == (highest, lowest)
+    print("✅ File pricing matches")
+
+
+if __name__ == "__main__":
+    test_prices_match_calc_price()
+    test_invalid_age()
+    test_summary_matches_reference()
+    test_price_file()
+    print("\n✅ All ticket pricing tests passed!")
@@ -45,22 +45,8 @@ print(f"Welcome {user['name']}! Your account has been registered with email {use
 
 
 # Question 4 – Cinema Ticketing System
-def calc_price(age, stu, wknd):
-    if age < 0 or age > 120:
-        raise ValueError("Invalid age")
-    if age < 12:
-        price = 5
-    elif age <= 17:
-        price = 8
-    elif age <= 59:
-        price = 12
-    else:
-        price = 6
-    if stu and age > 12:
-        price *= 0.8
-    if wknd:
-        price += 2
-    return price
+# calc_price lives in ticket_pricing.py with the batch (NumPy) version
+from ticket_pricing import calc_price, summarize_prices
 
 n = int(input("Enter number of customers: "))
 cust = []
@@ -75,15 +61,11 @@ for i in range(n):
 for c in cust:
     print("Age:", c["age"], "Student:", c["student"], "Weekend:", c["weekend"], "Price:", round(c["price"], 2))
 
-total = sum(c["price"] for c in cust)
-if n >= 4:
-    total *= 0.9
-print("Total:", round(total, 2))
-
-max_c = max(cust, key=lambda x: x["price"])
-min_c = min(cust, key=lambda x: x["price"])
-print("Highest:", round(max_c["price"], 2))
-print("Lowest:", round(min_c["price"], 2))
+# Total (10% off for 4+ customers), highest and lowest in one pass
+summary = summarize_prices([[c["price"] for c in cust]])
+print("Total:", round(summary["total"], 2))
+print("Highest:", round(summary["highest"], 2))
+print("Lowest:", round(summary["lowest"], 2))
 
 
 #Question 5 – Weather Alert System 
@@ -112,55 +94,44 @@ print("Kelvin: ", k)
 
 
 ### Question 6 – Sales Analytics (Max, Min & Median)
+# analyze_sales lives in sales_analytics.py with the incremental SalesAnalytics
+from sales_analytics import SalesAnalytics
 
-import statistics
-
-def analyze_sales(sales_list):
-    high = max(sales_list)
-    low = min(sales_list)
-    mid = statistics.median(sales_list)
-    return high, low, mid
 while True:
     n = int(input("Enter number of days: "))
     if n >= 5: break
         
     elif n < 5: print("Need at least 5")
 
-sales = []
+sales = SalesAnalytics()
 for i in range(n):
     val = float(input(f"Enter sale (Day {i+1}): "))
-    sales.append(val)
+    sales.add(val)
     
-h, l, m = analyze_sales(sales)
+h, l, m = sales.stats()
 print("Highest sales day:", h)
 print("Lowest sales day:", l)
 print("Median sales:", m)
 
 
 # Question 7 – E-commerce Inventory Management
+# update_inventory lives in inventory.py with the thread-safe Inventory engine
+from inventory import Inventory
 
-def update_inventory(inv, item, qty):
-    if item not in inv:
-        print("Item not found")
-    else:
-        if inv[item] + qty < 0:
-            print("Not enough stock for", item)
-        else:
-            inv[item] += qty
-    return inv
-
-inv = {"pen":10, "book":8, "bag":5, "marker":12, "register":6}
+inv = Inventory({"pen":10, "book":8, "bag":5, "marker":12, "register":6})
 
 
-print("Items:", inv)
+print("Items:", inv.snapshot())
 
 for i in range(3):
     it = input("Enter item: ")
     q = int(input("Enter qty: "))
-    inv = update_inventory(inv, it, -q)
-
-print("Inv:", inv)
-max_item = max(inv, key=inv.get)
-min_item = min(inv, key=inv.get)
-print("Max:", max_item, inv[max_item])
-print("Min:", min_item, inv[min_item])
+    result = inv.update(it, -q)
+    for error in result.errors:
+        print(error)
+
+print("Inv:", inv.snapshot())
+max_item, max_qty = inv.max_item()
+min_item, min_qty = inv.min_item()
+print("Max:", max_item, max_qty)
+print("Min:", min_item, min_qty)
@@ -2,13 +2,55 @@
 Synthetic Data Pipeline Package
 
 A modular package for generating synthetic customer data with statistics and visualization.
-"""
 
-from .data_generator import DataGenerator
-from .status import calculate_mean, calculate_median, calculate_std, get_all_stats, print_stats
-from .augment import augment_dataset, add_gaussian_noise, oversample_minority
-from .visuals import plot_histogram, plot_scatterplot, quick_data_overview
+Submodules and the names below are imported on first access (PEP 562), so
+`import src` stays cheap and e.g. `from src import calculate_mean` never
+loads matplotlib or scikit-learn.
+"""
+import importlib
 
 __version__ = "1.0.0"
-__all__ = ["DataGenerator", "calculate_mean", "calculate_median", "calculate_std", 
-          "augment_dataset", "plot_histogram", "plot_scatterplot"]
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
+    "DataGenerator": "data_generator",
+    "generate_parallel": "parallel_generator",
+    "calculate_mean": "status",
+    "calculate_median": "status",
+    "calculate_std": "status",
+    "get_all_stats": "status",
+    "print_stats": "status",
+    "StreamingStats": "streaming_stats",
+    "augment_dataset": "augment",
+    "add_gaussian_noise": "augment",
+    "oversample_minority": "augment",
+    "CategoricalEncoder": "encoding",
+    "StageCache": "cache",
+    "DataCorruptor": "corruption",
+    "export_model": "numpy_inference",
+    "plot_histogram": "visuals",
+    "plot_scatterplot": "visuals",
+    "quick_data_overview": "visuals",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__)
+        value = getattr(module, name)
+    else:
+        try:
+            value = importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    # Cache so __getattr__ is only hit once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
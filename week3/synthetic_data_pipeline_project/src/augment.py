@@ -4,6 +4,27 @@ Data augmentation module for enhancing datasets.
 import numpy as np
 import pandas as pd
 
+try:
+    from .instrumentation import instrument
+    from .schema import cast_like
+except ImportError:
+    from instrumentation import instrument
+    from schema import cast_like
+
+# Generated values keep their fractional part: integer columns are widened
+# to float32 (see schema.cast_like) instead of being rounded
+
+def _append_rows(df, parts, columns):
+    """Concatenate df and generated parts with one dtype per column.
+
+    The original columns are cast like the generated ones first: int32
+    income next to float32 synthetic income would otherwise become float64.
+    """
+    original = df.assign(**{col: cast_like(df[col].to_numpy(), df[col].dtype)
+                            for col in columns if col in df.columns})
+    return pd.concat([original] + list(parts), ignore_index=True)
+
+@instrument()
 def add_gaussian_noise(df, columns, noise_factor=0.1):
     """Add Gaussian noise to numerical columns."""
     df_augmented = df.copy()
@@ -11,11 +32,12 @@ def add_gaussian_noise(df, columns, noise_factor=0.1):
     for col in columns:
         if col in df.columns:
             noise = np.random.normal(0, df[col].std() * noise_factor, len(df))
-            df_augmented[col] = df_augmented[col] + noise
+            df_augmented[col] = cast_like(df[col].to_numpy(dtype=float) + noise, df[col].dtype)
     
     print(f" Added Gaussian noise to {len(columns)} columns")
     return df_augmented
 
+@instrument()
 def oversample_minority(df, target_column, ratio=0.5):
     """Oversample minority class to balance dataset."""
     # Find minority class
@@ -42,30 +64,86 @@ def oversample_minority(df, target_column, ratio=0.5):
     
     return df_augmented
 
+@instrument()
 def create_synthetic_combinations(df, numerical_cols, n_combinations=50):
     """Create synthetic data by combining existing samples."""
-    synthetic_samples = []
+    n_rows = len(df)
+    
+    # Draw all pairs of distinct rows at once
+    idx1 = np.random.randint(0, n_rows, n_combinations)
+    idx2 = (idx1 + np.random.randint(1, n_rows, n_combinations)) % n_rows
+    
+    # Synthetic rows copy the first row and average numerical features
+    synthetic_df = df.iloc[idx1].reset_index(drop=True)
+    for col in numerical_cols:
+        if col in df.columns:
+            values = df[col].to_numpy(dtype=float)
+            synthetic_df[col] = cast_like((values[idx1] + values[idx2]) / 2, df[col].dtype)
+    
+    df_augmented = _append_rows(df, [synthetic_df], numerical_cols)
+    
+    print(f" Created {n_combinations} synthetic combinations")
+    return df_augmented
+
+@instrument()
+def create_smote_samples(df, target_column, numerical_cols, n_samples=50, k_neighbors=5):
+    """Create synthetic rows by interpolating towards same-class nearest neighbours.
+    
+    Each class gets a share of n_samples proportional to its size. Neighbours
+    are found with a KD-tree on standardized numerical features, so rows are
+    never mixed across target classes.
+    """
+    from sklearn.neighbors import NearestNeighbors
+    
+    cols = [col for col in numerical_cols if col in df.columns and col != target_column]
+    features = df[cols].to_numpy(dtype=float)
+    scale = features.std(axis=0)
+    scale[scale == 0] = 1.0
+    scaled = features / scale
+    
+    labels = df[target_column].to_numpy()
+    classes, class_counts = np.unique(labels, return_counts=True)
+    per_class = np.random.multinomial(n_samples, class_counts / class_counts.sum())
     
-    for _ in range(n_combinations):
-        # Pick two random rows
-        idx1, idx2 = np.random.choice(len(df), 2, replace=False)
-        row1 = df.iloc[idx1]
-        row2 = df.iloc[idx2]
+    synthetic_parts = []
+    for cls, n_new in zip(classes, per_class):
+        class_idx = np.flatnonzero(labels == cls)
+        if n_new == 0 or len(class_idx) < 2:
+            continue
         
-        # Create synthetic row by averaging numerical features
-        synthetic_row = row1.copy()
-        for col in numerical_cols:
-            if col in df.columns:
-                synthetic_row[col] = (row1[col] + row2[col]) / 2
+        k = min(k_neighbors, len(class_idx) - 1)
+        index = NearestNeighbors(n_neighbors=k + 1, algorithm='kd_tree', n_jobs=-1)
+        index.fit(scaled[class_idx])
         
-        synthetic_samples.append(synthetic_row)
+        # Base rows, then one of their k neighbours. When most rows get used
+        # anyway, query every row once and look the neighbours up.
+        base = np.random.randint(0, len(class_idx), n_new)
+        if n_new >= len(class_idx):
+            neighbours = index.kneighbors(n_neighbors=k, return_distance=False)[base]
+        else:
+            # Column 0 of a query is the point itself
+            neighbours = index.kneighbors(scaled[class_idx[base]], return_distance=False)[:, 1:]
+        chosen = neighbours[np.arange(n_new), np.random.randint(0, k, n_new)]
+        
+        base_rows = class_idx[base]
+        neighbour_rows = class_idx[chosen]
+        gap = np.random.rand(n_new, 1)
+        
+        part = df.iloc[base_rows].reset_index(drop=True)
+        values = features[base_rows] + gap * (features[neighbour_rows] - features[base_rows])
+        for j, col in enumerate(cols):
+            part[col] = cast_like(values[:, j], df[col].dtype)
+        synthetic_parts.append(part)
     
-    synthetic_df = pd.DataFrame(synthetic_samples)
-    df_augmented = pd.concat([df, synthetic_df], ignore_index=True)
+    if synthetic_parts:
+        df_augmented = _append_rows(df, synthetic_parts, cols)
+    else:
+        df_augmented = df.copy()
     
-    print(f" Created {n_combinations} synthetic combinations")
+    print(f" Created {len(df_augmented) - len(df)} SMOTE-style samples")
     return df_augmented
 
+@instrument()
 def augment_dataset(df, target_column, numerical_cols, method='noise'):
     """Main augmentation function with multiple methods."""
     print(f"🔄 Augmenting dataset using method: {method}")
@@ -76,6 +154,8 @@ def augment_dataset(df, target_column, numerical_cols, method='noise'):
         return oversample_minority(df, target_column)
     elif method == 'synthetic':
         return create_synthetic_combinations(df, numerical_cols)
+    elif method == 'smote':
+        return create_smote_samples(df, target_column, numerical_cols)
     elif method == 'all':
         # Apply all methods
         df_noise = add_gaussian_noise(df, numerical_cols, noise_factor=0.05)
@@ -0,0 +1,240 @@
+"""
+Benchmark suite for the pipeline stages.
+
+Runs generation, cleaning, encoding, every augmentation method, statistics
+and model training at several dataset sizes. Every stage gets one untimed
+warm-up call; the median wall time of the timed repeats, throughput
+(rows/s) and tracemalloc peak memory per stage are written to JSON and optionally
+compared against a stored baseline to flag regressions.
+
+Usage (from the project root):
+    python -m src.benchmark --sizes 1000 10000 100000
+    python -m src.benchmark --output results/benchmark.json --save-baseline
+    python -m src.benchmark --baseline results/benchmark_baseline.json
+"""
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+try:
+    from .augment import augment_dataset
+    from .data_generator import DataGenerator
+    from .data_preparation import encode_categorical_variables, handle_missing_values
+    from .model_trainer import ModelTrainer
+    from .paths import RESULTS_DIR
+    from .status import get_all_stats
+except ImportError:
+    from augment import augment_dataset
+    from data_generator import DataGenerator
+    from data_preparation import encode_categorical_variables, handle_missing_values
+    from model_trainer import ModelTrainer
+    from paths import RESULTS_DIR
+    from status import get_all_stats
+
+NUMERICAL_COLS = ['age', 'income', 'purchase_amount', 'monthly_visits', 'satisfaction_score']
+TARGET_COL = 'purchased'
+AUGMENT_METHODS = ['noise', 'oversample', 'synthetic', 'smote', 'all']
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, 'benchmark.json')
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, 'benchmark_baseline.json')
+
+
+def _with_missing(df, rate=0.05, seed=0):
+    """Copy of df with a fraction of feature values blanked out."""
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    for col in df.columns:
+        if col != TARGET_COL:
+            mask = rng.random(len(df)) < rate
+            df[col] = df[col].astype(float if col in NUMERICAL_COLS else object)
+            df.loc[mask, col] = np.nan
+    return df
+
+
+def build_stages(n_rows, work_dir):
+    """Return (name, setup, run) triples; setup builds inputs outside the timer.
+
+    Inputs are generated on first use, so stages filtered out by --stages
+    cost nothing. Every setup() call returns a fresh copy, because some
+    stages (e.g. handle_missing_values) modify their input.
+    """
+    generator = DataGenerator(random_seed=42)
+
+    @functools.lru_cache(maxsize=None)
+    def raw():
+        return DataGenerator(random_seed=42).generate_dataset(n_rows)
+
+    @functools.lru_cache(maxsize=None)
+    def dirty():
+        return _with_missing(raw())
+
+    @functools.lru_cache(maxsize=None)
+    def cleaned():
+        return encode_categorical_variables(raw())
+
+    def train_setup():
+        path = os.path.join(work_dir, f'train_{n_rows}.csv')
+        if not os.path.isfile(path):
+            cleaned().to_csv(path, index=False)
+        return ModelTrainer(data_path=path,
+                            models_dir=os.path.join(work_dir, 'models'),
+                            results_dir=os.path.join(work_dir, 'results'))
+
+    stages = [
+        ('generate_dataset', lambda: None, lambda _: generator.generate_dataset(n_rows)),
+        ('handle_missing_values', lambda: dirty().copy(), handle_missing_values),
+        ('encode_categorical_variables', lambda: raw().copy(), encode_categorical_variables),
+    ]
+    for method in AUGMENT_METHODS:
+        stages.append((f'augment_dataset[{method}]', lambda: cleaned().copy(),
+                       lambda df, m=method: augment_dataset(df, TARGET_COL, NUMERICAL_COLS, m)))
+    stages += [
+        ('get_all_stats', lambda: raw()['income'].copy(), get_all_stats),
+        ('ModelTrainer.run', train_setup, lambda trainer: trainer.run()),
+    ]
+    return stages
+
+
+def measure(run, setup, track_memory, repeats=3):
+    """Time repeats calls after an untimed warm-up; return (median, min, peak MB).
+
+    The warm-up absorbs one-off costs such as lazy imports and compiled
+    caches (SMOTE's first call takes over a second, later calls ~0.06 s).
+    Each call gets its own input from setup(), built outside the timer.
+    With track_memory another call records its tracemalloc peak.
+    """
+    peak_mb = None
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        run(setup())
+        for _ in range(repeats):
+            arg = setup()
+            start = time.perf_counter()
+            run(arg)
+            timings.append(time.perf_counter() - start)
+        if track_memory:
+            arg = setup()
+            tracemalloc.start()
+            try:
+                run(arg)
+                peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+            finally:
+                tracemalloc.stop()
+    return float(np.median(timings)), min(timings), peak_mb
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, stages=None, track_memory=True, repeats=3):
+    """Run every stage at every size and return the result records.
+
+    'seconds' is the median of the timed repeats, 'min_seconds' the fastest.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n_rows in sizes:
+            for name, setup, run in build_stages(n_rows, work_dir):
+                if stages and name.split('[')[0] not in stages and name not in stages:
+                    continue
+                seconds, min_seconds, peak_mb = measure(run, setup, track_memory, repeats)
+                record = {
+                    'stage': name,
+                    'rows': n_rows,
+                    'seconds': seconds,
+                    'min_seconds': min_seconds,
+                    'repeats': repeats,
+                    'rows_per_sec': n_rows / seconds if seconds > 0 else None,
+                    'peak_mb': peak_mb,
+                }
+                results.append(record)
+                peak = f"{peak_mb:9.1f} MB" if peak_mb is not None else "        n/a"
+                print(f"{name:32s} {n_rows:>10d} rows {seconds:9.3f} s "
+                      f"{record['rows_per_sec'] or 0:14,.0f} rows/s {peak}")
+    return results
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.05):
+    """Return records slower or heavier than baseline by more than tolerance.
+
+    Timings under min_seconds are too noisy to compare and are skipped.
+    """
+    previous = {(r['stage'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    for record in results:
+        old = previous.get((record['stage'], record['rows']))
+        if old is None:
+            continue
+        for key in ('seconds', 'peak_mb'):
+            if record.get(key) is None or old.get(key) in (None, 0):
+                continue
+            if key == 'seconds' and record[key] < min_seconds:
+                continue
+            ratio = record[key] / old[key]
+            if ratio > 1 + tolerance:
+                regressions.append({'stage': record['stage'], 'rows': record['rows'],
+                                    'metric': key, 'baseline': old[key],
+                                    'current': record[key], 'ratio': ratio})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Row counts to run, e.g. 1000 100000 10000000")
+    parser.add_argument('--stages', nargs='+', default=None,
+                        help="Only run these stages (e.g. generate_dataset augment_dataset)")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--baseline', default=None, help="Baseline JSON to compare against")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f"Also write the results to {DEFAULT_BASELINE}")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown/memory growth before flagging (0.25 = 25%%)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass")
+    parser.add_argument('--repeats', type=int, default=3,
+                        help="Timed calls per stage after the warm-up; the median is reported")
+    args = parser.parse_args(argv)
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+
+    results = run_benchmarks(args.sizes, args.stages, track_memory=not args.no_memory,
+                             repeats=args.repeats)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'cpu_count': os.cpu_count(),
+        },
+        'results': results,
+    }
+
+    targets = [args.output] + ([DEFAULT_BASELINE] if args.save_baseline else [])
+    for path in targets:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved benchmark results: {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} @ {r['rows']} rows: {r['metric']} "
+                  f"{r['baseline']:.3f} -> {r['current']:.3f} ({r['ratio']:.2f}x)")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
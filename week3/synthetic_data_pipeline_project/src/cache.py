@@ -0,0 +1,201 @@
+"""
+Content-addressed cache for pipeline stage outputs.
+
+A stage's key is a hash of its name, its input data, its parameters and
+the source code of the module that defines it. Paths are hashed as
+strings; wrap one in FileRef to hash the contents of the file it names. Unchanged stages are
+served from disk; the cache directory is kept under a size budget by
+evicting the least recently used entries.
+"""
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+import numpy as np
+
+try:
+    from .paths import PROJECT_ROOT
+except ImportError:
+    from paths import PROJECT_ROOT
+
+DEFAULT_CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'stages')
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+VALUE_FILE = 'value.joblib'
+META_FILE = 'meta.json'
+
+
+class FileRef:
+    """A file (or a directory of files, e.g. an .npy column store) that
+    hash_data fingerprints by content rather than by name."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+
+    def __fspath__(self):
+        return self.path
+
+    def __repr__(self):
+        return f"FileRef({self.path!r})"
+
+
+def hash_data(obj, hasher=None):
+    """Feed a stable fingerprint of obj into hasher (sha256 by default).
+
+    Every value is prefixed with a type tag, so a FileRef is never confused
+    with a string holding the same bytes as the file it names. Plain
+    strings are hashed as strings, even when they name a file.
+    """
+    hasher = hasher or hashlib.sha256()
+    # Without pandas loaded obj cannot be a pandas object, so don't import it
+    pd = sys.modules.get('pandas')
+    hasher.update(f"<{type(obj).__name__}>".encode())
+    if pd is not None and isinstance(obj, pd.DataFrame):
+        hasher.update(repr([(str(c), str(t)) for c, t in obj.dtypes.items()]).encode())
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif pd is not None and isinstance(obj, pd.Series):
+        hasher.update(f"{obj.name}:{obj.dtype}".encode())
+        hasher.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        hasher.update(f"{obj.dtype}{obj.shape}".encode())
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(b'[')
+        for item in obj:
+            hash_data(item, hasher)
+        hasher.update(b']')
+    elif isinstance(obj, dict):
+        for key in sorted(obj, key=str):
+            hasher.update(str(key).encode())
+            hash_data(obj[key], hasher)
+    elif isinstance(obj, FileRef):
+        if os.path.isdir(obj.path):
+            for root, dirs, files in os.walk(obj.path):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    hasher.update(os.path.relpath(path, obj.path).encode())
+                    hash_file(path, hasher)
+        else:
+            hash_file(obj.path, hasher)
+    else:
+        hasher.update(repr(obj).encode())
+    return hasher
+
+
+def hash_file(path, hasher=None, block_size=1 << 20):
+    """Hash a file's contents in blocks."""
+    hasher = hasher or hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            hasher.update(block)
+    return hasher
+
+
+def code_version(func):
+    """Hash of the source file defining func, so edits invalidate its entries."""
+    try:
+        return hash_file(inspect.getsourcefile(inspect.unwrap(func))).hexdigest()
+    except (TypeError, OSError):
+        return getattr(func, '__qualname__', repr(func))
+
+
+class StageCache:
+    """Disk cache of stage outputs keyed by content, with LRU eviction."""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Pipeline stages use the cache from several threads; the lock keeps
+        # eviction from deleting an entry while another thread reads it
+        self._lock = threading.RLock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, stage, inputs=(), params=None, func=None, code=()):
+        """Hash of the stage name, inputs, params and the source of func
+        plus any extra callables in code that the stage depends on."""
+        hasher = hashlib.sha256(stage.encode())
+        hash_data(list(inputs), hasher)
+        hash_data(params or {}, hasher)
+        for dependency in ([func] if func is not None else []) + list(code):
+            hasher.update(code_version(dependency).encode())
+        return hasher.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key):
+        """Return (True, value) on a hit, (False, None) otherwise."""
+        import joblib
+        entry = self._entry(key)
+        meta = os.path.join(entry, META_FILE)
+        with self._lock:
+            if not os.path.isfile(meta):
+                return False, None
+            value = joblib.load(os.path.join(entry, VALUE_FILE))
+            os.utime(meta)  # mark as recently used
+        return True, value
+
+    def put(self, key, value, stage=None):
+        entry = self._entry(key)
+        tmp = f"{entry}.tmp-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        import joblib
+        joblib.dump(value, os.path.join(tmp, VALUE_FILE))
+        # meta.json is written last: an entry without it is incomplete
+        with open(os.path.join(tmp, META_FILE), 'w') as f:
+            json.dump({'stage': stage, 'created': time.time()}, f)
+        with self._lock:
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+            self.evict()
+
+    def run(self, stage, func, inputs=(), params=None, code=()):
+        """Return func(*inputs, **params), reusing a cached result when possible."""
+        params = params or {}
+        key = self.key(stage, inputs, params, func, code)
+        hit, value = self.get(key)
+        if hit:
+            print(f"Cache hit: {stage}")
+            return value
+        value = func(*inputs, **params)
+        self.put(key, value, stage=stage)
+        return value
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if '.tmp-' in name:
+                continue  # still being written by put()
+            entry = self._entry(name)
+            meta = os.path.join(entry, META_FILE)
+            if not os.path.isfile(meta):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+            entries.append((os.path.getmtime(meta), size, entry))
+        return entries
+
+    def size(self):
+        with self._lock:
+            return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            os.makedirs(self.cache_dir, exist_ok=True)
@@ -0,0 +1,188 @@
+"""
+Dirty-data injection for load-testing the cleaning stage.
+
+DataCorruptor takes clean rows from DataGenerator and injects MCAR and MAR
+missing values, outliers, category typos and duplicate rows at
+configurable rates. Every defect is drawn as a whole-column boolean mask.
+
+Corruption is applied per STREAM_BLOCK_SIZE block with an RNG stream keyed
+on (random_seed, block index), so a corrupted dataset is the same whether
+it is built in memory with corrupt() or streamed with corrupt_stream(), and
+for any chunk size.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    from .data_generator import DataGenerator, STREAM_BLOCK_SIZE
+    from .error_log import log_error
+    from .instrumentation import instrument
+    from .schema import apply_schema
+except ImportError:
+    from data_generator import DataGenerator, STREAM_BLOCK_SIZE
+    from error_log import log_error
+    from instrumentation import instrument
+    from schema import apply_schema
+
+NUMERICAL_COLS = ['age', 'income', 'purchase_amount', 'monthly_visits', 'satisfaction_score']
+CATEGORICAL_COLS = ['gender', 'product_type']
+TARGET_COL = 'purchased'
+
+
+def _typo_variants(word):
+    """A few realistic misspellings of word (case, whitespace, dropped or swapped letters)."""
+    variants = [word.lower(), word.upper(), f"{word} ", word[:-1]]
+    if len(word) > 2:
+        variants.append(word[0] + word[2] + word[1] + word[3:])
+    return variants
+
+
+class DataCorruptor:
+    """Injects reproducible defects into synthetic customer data.
+
+    missing_rate        MCAR share of missing values in numerical columns and the target
+    categorical_missing_rate  MCAR share of missing values in categorical columns
+    mar_rate            extra missing values in mar_column, more likely the higher
+                        mar_driver is within its block (missing at random)
+    outlier_rate        share of numerical values multiplied by 3..outlier_scale (rounded)
+    typo_rate           share of categorical values replaced by a misspelling
+    duplicate_rate      share of rows overwritten with a copy of another row
+    The defaults match the missing-value rates of data/raw/uncleaned_data.csv.
+    """
+
+    def __init__(self, random_seed=42, missing_rate=0.05, categorical_missing_rate=0.03,
+                 mar_rate=0.0, mar_column='income', mar_driver='age',
+                 outlier_rate=0.0, outlier_scale=10.0, typo_rate=0.0, duplicate_rate=0.0):
+        self.random_seed = random_seed
+        self.rates = {
+            'missing_rate': missing_rate,
+            'categorical_missing_rate': categorical_missing_rate,
+            'mar_rate': mar_rate,
+            'outlier_rate': outlier_rate,
+            'typo_rate': typo_rate,
+            'duplicate_rate': duplicate_rate,
+        }
+        for name, rate in self.rates.items():
+            if not 0.0 <= rate <= 1.0:
+                error_msg = f"{name} must be between 0 and 1, got {rate}"
+                log_error(error_msg)
+                raise ValueError(error_msg)
+        self.mar_column = mar_column
+        self.mar_driver = mar_driver
+        self.outlier_scale = outlier_scale
+
+    def _rng(self, block_index):
+        # spawn_key (block, 1) never collides with the generator's (block,)
+        seed_seq = np.random.SeedSequence(self.random_seed, spawn_key=(block_index, 1))
+        return np.random.default_rng(seed_seq)
+
+    def corrupt_block(self, block, block_index=0):
+        """Return a corrupted copy of one block of rows."""
+        rng = self._rng(block_index)
+        n_rows = len(block)
+        rates = self.rates
+        num_cols = [col for col in NUMERICAL_COLS if col in block.columns]
+        cat_cols = [col for col in CATEGORICAL_COLS if col in block.columns]
+        missing_cols = num_cols + ([TARGET_COL] if TARGET_COL in block.columns else [])
+
+        # Work on float copies so NaN and out-of-range values fit
+        data = {col: block[col].to_numpy(dtype=float, copy=True) for col in missing_cols}
+
+        # Outliers: scale a random share of each numerical column
+        if rates['outlier_rate'] and num_cols:
+            mask = rng.random((n_rows, len(num_cols))) < rates['outlier_rate']
+            factors = rng.uniform(3.0, self.outlier_scale, (n_rows, len(num_cols)))
+            for j, col in enumerate(num_cols):
+                data[col][mask[:, j]] = np.rint(data[col][mask[:, j]] * factors[mask[:, j], j])
+
+        # MCAR missing values
+        if rates['missing_rate'] and missing_cols:
+            mask = rng.random((n_rows, len(missing_cols))) < rates['missing_rate']
+            for j, col in enumerate(missing_cols):
+                data[col][mask[:, j]] = np.nan
+
+        # MAR missing values: probability grows with the driver's rank in the block
+        if rates['mar_rate'] and self.mar_column in data and self.mar_driver in block.columns:
+            rank = block[self.mar_driver].rank(pct=True, method='average').to_numpy()
+            mask = rng.random(n_rows) < np.minimum(1.0, 2.0 * rates['mar_rate'] * rank)
+            data[self.mar_column][mask] = np.nan
+
+        corrupted = block.assign(**data)
+
+        # Categorical defects act on codes: typos index a per-category variant table
+        for col in cat_cols:
+            values = corrupted[col].astype('category')
+            categories = list(values.cat.categories)
+            codes = values.cat.codes.to_numpy()
+            out = np.asarray(categories + [np.nan], dtype=object)[codes]
+            if rates['typo_rate'] and categories:
+                variants = [_typo_variants(str(value)) for value in categories]
+                width = min(len(v) for v in variants)
+                table = np.array([v[:width] for v in variants], dtype=object)
+                mask = (rng.random(n_rows) < rates['typo_rate']) & (codes >= 0)
+                out[mask] = table[codes[mask], rng.integers(0, width, mask.sum())]
+            if rates['categorical_missing_rate']:
+                out[rng.random(n_rows) < rates['categorical_missing_rate']] = np.nan
+            corrupted[col] = out
+
+        # Duplicates last, so they are exact copies of (already dirty) rows
+        if rates['duplicate_rate'] and n_rows > 1:
+            duplicate = rng.random(n_rows) < rates['duplicate_rate']
+            sources = np.flatnonzero(~duplicate)
+            if len(sources):
+                take = np.arange(n_rows)
+                take[duplicate] = sources[rng.integers(0, len(sources), duplicate.sum())]
+                corrupted = corrupted.iloc[take]
+                corrupted.index = block.index
+
+        return apply_schema(corrupted)
+
+    @instrument()
+    def corrupt(self, df):
+        """Corrupt a whole DataFrame block by block (rows are positional)."""
+        if len(df) == 0:
+            return df.copy()
+        blocks = [self.corrupt_block(df.iloc[start:start + STREAM_BLOCK_SIZE],
+                                     start // STREAM_BLOCK_SIZE)
+                  for start in range(0, len(df), STREAM_BLOCK_SIZE)]
+        corrupted = pd.concat(blocks) if len(blocks) > 1 else blocks[0]
+        corrupted = apply_schema(corrupted)
+        print(f"Injected defects into {len(df)} rows: "
+              f"{int(corrupted.isna().sum().sum())} missing values")
+        return corrupted
+
+    def corrupt_stream(self, n_samples, chunk_size=100000, generator=None):
+        """Yield corrupted chunks from DataGenerator.generate_dataset_stream."""
+        generator = generator or DataGenerator(self.random_seed)
+        return generator.generate_dataset_stream(n_samples, chunk_size=chunk_size,
+                                                 block_transform=self.corrupt_block)
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    try:
+        from .paths import RAW_DATA_DIR
+        from .storage import write_frames
+    except ImportError:
+        from paths import RAW_DATA_DIR
+        from storage import write_frames
+
+    parser = argparse.ArgumentParser(description="Generate a dirty dataset for the cleaning stage.")
+    parser.add_argument("--n-samples", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=100000)
+    parser.add_argument("--missing-rate", type=float, default=0.05)
+    parser.add_argument("--mar-rate", type=float, default=0.0)
+    parser.add_argument("--outlier-rate", type=float, default=0.0)
+    parser.add_argument("--typo-rate", type=float, default=0.0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.0)
+    parser.add_argument("--output", default=os.path.join(RAW_DATA_DIR, 'uncleaned_data.csv'))
+    args = parser.parse_args()
+
+    corruptor = DataCorruptor(args.seed, missing_rate=args.missing_rate, mar_rate=args.mar_rate,
+                              outlier_rate=args.outlier_rate, typo_rate=args.typo_rate,
+                              duplicate_rate=args.duplicate_rate)
+    n_rows = write_frames(corruptor.corrupt_stream(args.n_samples, args.chunk_size), args.output)
+    print(f"Dirty dataset with {n_rows} rows saved to: {args.output}")
@@ -1,7 +1,19 @@
 import pandas as pd
 import numpy as np
 import os
-from datetime import datetime
+
+try:
+    from .error_log import log_error
+    from .instrumentation import instrument
+    from .paths import RAW_DATA_DIR
+    from .schema import apply_schema
+    from .storage import FORMATS, save_frame
+except ImportError:
+    from error_log import log_error
+    from instrumentation import instrument
+    from paths import RAW_DATA_DIR
+    from schema import apply_schema
+    from storage import FORMATS, save_frame
 
 # Custom Exception Classes
 class InvalidFilePathError(Exception):
@@ -12,41 +24,73 @@ class DataGenerationError(Exception):
     """Custom exception for data generation failures."""
     pass
 
+# Rows per independently seeded block used by the streaming generator.
+# Chunks are cut from these blocks, so output does not depend on chunk_size.
+STREAM_BLOCK_SIZE = 65536
+
+
+def _purchase_probability(income, satisfaction_score):
+    """Probability of purchase used for the binary target."""
+    return (income / 100000) * 0.5 + (satisfaction_score / 10) * 0.3 + 0.2
+
+
+def _generate_block(random_seed, block_index, n_rows):
+    """Generate one block of rows from its own seeded RNG stream."""
+    seed_seq = np.random.SeedSequence(random_seed, spawn_key=(block_index,))
+    rng = np.random.default_rng(seed_seq)
+
+    age = rng.integers(18, 80, n_rows)
+    income = rng.integers(20000, 100000, n_rows)
+    purchase_amount = rng.integers(10, 500, n_rows)
+    monthly_visits = rng.integers(1, 20, n_rows)
+    satisfaction_score = rng.integers(1, 11, n_rows)
+
+    gender = rng.choice(['Male', 'Female'], n_rows)
+    product_type = rng.choice(['Electronics', 'Clothing', 'Books'], n_rows)
+
+    purchased = rng.binomial(1, _purchase_probability(income, satisfaction_score))
+
+    return apply_schema(pd.DataFrame({
+        'age': age,
+        'income': income,
+        'purchase_amount': purchase_amount,
+        'monthly_visits': monthly_visits,
+        'satisfaction_score': satisfaction_score,
+        'gender': gender,
+        'product_type': product_type,
+        'purchased': purchased
+    }))
+
+
 class DataGenerator:
     """Generates synthetic customer data for classification."""
     
     def __init__(self, random_seed=42):
+        self.random_seed = random_seed
         np.random.seed(random_seed)
     
     def log_error(self, error_message):
-        """Save error messages to logs/errors.txt"""
-        try:
-            # Create logs directory if it doesn't exist
-            if not os.path.exists('../logs'):
-                os.makedirs('../logs')
-            
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_message = f"[{timestamp}] ERROR: {error_message}\n"
-            
-            with open('../logs/errors.txt', 'a') as f:
-                f.write(log_message)
-            print(f"Error logged to ../logs/errors.txt")
-        except Exception as e:
-            print(f"Failed to write to log file: {e}")
+        """Queue the error on the shared background logger (logs/errors.txt)."""
+        log_error(error_message)
     
-    def generate_dataset(self, n_samples=500):
-        """Generate synthetic dataset with error handling."""
-        
-        # Parameter validation with custom exceptions
-        if not isinstance(n_samples, int):
-            error_msg = f"n_samples must be integer, got {type(n_samples).__name__}"
+    def _validate_count(self, name, value):
+        """Raise DataGenerationError unless value is a positive integer."""
+        if not isinstance(value, int):
+            error_msg = f"{name} must be integer, got {type(value).__name__}"
             self.log_error(error_msg)
             raise DataGenerationError(error_msg)
         
-        if n_samples <= 0:
-            error_msg = f"n_samples must be positive, got {n_samples}"
+        if value <= 0:
+            error_msg = f"{name} must be positive, got {value}"
             self.log_error(error_msg)
             raise DataGenerationError(error_msg)
+    
+    @instrument()
+    def generate_dataset(self, n_samples=500):
+        """Generate synthetic dataset with error handling."""
+        
+        # Parameter validation with custom exceptions
+        self._validate_count('n_samples', n_samples)
         
         try:
             # 5 Numerical features
@@ -61,10 +105,10 @@ class DataGenerator:
             product_type = np.random.choice(['Electronics', 'Clothing', 'Books'], n_samples)
             
             # Binary target
-            purchase_prob = (income / 100000) * 0.5 + (satisfaction_score / 10) * 0.3 + 0.2
+            purchase_prob = _purchase_probability(income, satisfaction_score)
             purchased = np.random.binomial(1, purchase_prob, n_samples)
             
-            # Create DataFrame
+            # Create DataFrame with the compact schema types
             data = {
                 'age': age,
                 'income': income,
@@ -76,15 +120,60 @@ class DataGenerator:
                 'purchased': purchased
             }
             
-            return pd.DataFrame(data)
+            return apply_schema(pd.DataFrame(data))
             
         except Exception as e:
             error_msg = f"Data generation failed: {str(e)}"
             self.log_error(error_msg)
             raise DataGenerationError(error_msg)
     
-    def save_dataset(self, df, filename='generated_data.csv'):
-        """Save dataset with file path validation."""
+    def generate_dataset_stream(self, n_samples, chunk_size=100000, block_transform=None):
+        """Yield the dataset as DataFrame chunks of at most chunk_size rows.
+        
+        Rows come from per-block RNG streams derived from the generator's
+        seed, so the concatenated output is identical for any chunk_size
+        and peak memory stays bounded by one block plus one chunk.
+        block_transform(block, block_index), if given, is applied to each
+        block before it is cut into chunks (e.g. DataCorruptor.corrupt_block).
+        """
+        self._validate_count('n_samples', n_samples)
+        self._validate_count('chunk_size', chunk_size)
+        
+        block, block_index = None, -1
+        for start in range(0, n_samples, chunk_size):
+            stop = min(start + chunk_size, n_samples)
+            pieces = []
+            pos = start
+            while pos < stop:
+                index = pos // STREAM_BLOCK_SIZE
+                block_start = index * STREAM_BLOCK_SIZE
+                if index != block_index:
+                    block_rows = min(STREAM_BLOCK_SIZE, n_samples - block_start)
+                    try:
+                        block = _generate_block(self.random_seed, index, block_rows)
+                        if block_transform is not None:
+                            block = block_transform(block, index)
+                    except Exception as e:
+                        error_msg = f"Data generation failed: {str(e)}"
+                        self.log_error(error_msg)
+                        raise DataGenerationError(error_msg)
+                    block_index = index
+                take = min(stop, block_start + len(block)) - pos
+                offset = pos - block_start
+                pieces.append(block.iloc[offset:offset + take])
+                pos += take
+            
+            chunk = pd.concat(pieces, ignore_index=True) if len(pieces) > 1 else pieces[0].copy()
+            chunk.index = pd.RangeIndex(start, stop)
+            yield chunk
+    
+    @instrument()
+    def save_dataset(self, df, filename='generated_data.csv', directory=None):
+        """Save dataset with file path validation.
+        
+        The format follows the extension (.csv, .parquet, .feather, .npy) and
+        the file goes to data/raw unless another directory is given.
+        """
         
         # File path validation
         if not isinstance(filename, str):
@@ -92,8 +181,9 @@ class DataGenerator:
             self.log_error(error_msg)
             raise InvalidFilePathError(error_msg)
         
-        if not filename.endswith('.csv'):
-            error_msg = f"File must have .csv extension, got {filename}"
+        if not filename.endswith(tuple(FORMATS)):
+            supported = ', '.join(sorted(FORMATS))
+            error_msg = f"File must have one of {supported} extensions, got {filename}"
             self.log_error(error_msg)
             raise InvalidFilePathError(error_msg)
         
@@ -105,8 +195,8 @@ class DataGenerator:
             raise InvalidFilePathError(error_msg)
         
         try:
-            filepath = f'../data/raw/{filename}'
-            df.to_csv(filepath, index=False)
+            filepath = os.path.join(directory or RAW_DATA_DIR, filename)
+            save_frame(df, filepath)
             print(f"Dataset saved to: {filepath}")
             return filepath
             
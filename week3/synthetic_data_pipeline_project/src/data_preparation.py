@@ -1,35 +1,162 @@
+import numpy as np
 import pandas as pd
 
-# Load CSV data
+try:
+    from .instrumentation import instrument
+    from .storage import iter_frames, load_frame, save_frame, write_frames
+except ImportError:
+    from instrumentation import instrument
+    from storage import iter_frames, load_frame, save_frame, write_frames
 
-def load_data(file_path):
-    return pd.read_csv(file_path)
+# Load data (.csv, .parquet, .feather or .npy), optionally only some columns
+
+@instrument()
+def load_data(file_path, columns=None):
+    return load_frame(file_path, columns=columns)
 
 # Handle missing values
 
+@instrument()
 def handle_missing_values(df):
-    # Fill missing values with the mean for numerical columns
-    for column in df.select_dtypes(include=['float64', 'int64']).columns:
-        df[column].fillna(df[column].mean(), inplace=True)
+    # Fill missing values with the mean for numerical columns (any width,
+    # so the compact int8/int16/int32/float32 schema types are included)
+    fill_values = {}
+    for column in df.select_dtypes(include='number').columns:
+        if df[column].hasnans:
+            fill_values[column] = df[column].mean()
     # Fill missing values with the mode for categorical columns
-    for column in df.select_dtypes(include=['object']).columns:
+    for column in df.select_dtypes(include=['object', 'category', 'string']).columns:
         mode = df[column].mode()
         if not mode.empty:
-            df[column].fillna(mode[0], inplace=True)
+            fill_values[column] = mode[0]
+    return _fill_missing(df, fill_values)
+
+def _fill_missing(df, fill_values):
+    # Assign back per column; chained inplace fillna is a no-op under Copy-on-Write
+    for column, value in fill_values.items():
+        if column in df.columns:
+            df[column] = df[column].fillna(value)
     return df
 
-# Encode categorical variables
+# Encode categorical variables; a fitted encoding.CategoricalEncoder gives
+# a fixed column layout regardless of which categories are in the batch
 
-def encode_categorical_variables(df):
+@instrument()
+def encode_categorical_variables(df, encoder=None):
+    if encoder is not None:
+        return encoder.transform(df, output='dense')
     return pd.get_dummies(df, drop_first=True)
 
-# Save cleaned data
+# Save cleaned data in the format implied by output_path
 
+@instrument()
 def save_cleaned_data(df, output_path):
-    df.to_csv(output_path, index=False)
+    save_frame(df, output_path)
+
+# Out-of-core cleaning: pass one collects the fill values, category
+# vocabularies and the output dtypes, pass two imputes and one-hot encodes
+# every chunk against that fixed schema so all chunks get the same columns
+# and dtypes
+
+@instrument()
+def collect_cleaning_stats(file_path, chunksize=100000):
+    columns, sums, counts, value_counts, seen_dtypes = {}, {}, {}, {}, {}
+    categorical, recount = set(), set()
+    for chunk in iter_frames(file_path, chunksize=chunksize):
+        for column in chunk.columns:
+            series = chunk[column]
+            columns.setdefault(column, None)
+            if _is_numeric(series):
+                seen_dtypes.setdefault(column, set()).add(series.dtype)
+                if column in categorical:
+                    # e.g. numbers in a chunk of a text column
+                    value_counts[column] = _add_counts(value_counts[column], series)
+                else:
+                    sums[column] = sums.get(column, 0.0) + series.sum()
+                    counts[column] = counts.get(column, 0) + series.count()
+                continue
+            # Any chunk with text makes the whole column categorical
+            if column not in categorical:
+                categorical.add(column)
+                if counts.pop(column, None):
+                    recount.add(column)  # earlier numeric chunks were not counted
+                sums.pop(column, None)
+                value_counts[column] = pd.Series(dtype='int64')
+            value_counts[column] = _add_counts(value_counts[column], series)
+
+    if recount:
+        value_counts.update({column: pd.Series(dtype='int64') for column in recount})
+        for chunk in iter_frames(file_path, chunksize=chunksize, columns=sorted(recount)):
+            for column in recount:
+                value_counts[column] = _add_counts(value_counts[column], chunk[column])
+
+    means = {column: sums[column] / counts[column] if counts[column] else float('nan')
+             for column in sums}
+    modes, categories = {}, {}
+    for column, vc in value_counts.items():
+        categories[column] = sorted(vc.index)
+        if len(vc):
+            # Ties resolve to the smallest value, like Series.mode()[0]
+            top = vc[vc == vc.max()].index
+            modes[column] = sorted(top)[0]
+
+    # Output schema, in the column order pd.get_dummies produces: other
+    # columns first, then the drop_first dummies of each categorical column
+    dtypes = {}
+    for column in columns:
+        if column not in categorical:
+            dtypes[column] = str(_output_dtype(seen_dtypes[column]))
+    for column in columns:
+        if column in categorical:
+            dtypes.update({f"{column}_{value}": 'bool' for value in categories[column][1:]})
+    return {'means': means, 'modes': modes, 'categories': categories, 'dtypes': dtypes}
+
+def _category_values(series):
+    # Numbers read from a chunk of a text column are counted as text
+    if _is_numeric(series):
+        return series.astype(str).where(series.notna())
+    return series
+
+def _add_counts(counts_so_far, series):
+    return counts_so_far.add(_category_values(series).value_counts(), fill_value=0)
+
+def _output_dtype(dtypes):
+    # Chunks with missing values widen compact int/bool columns to a float
+    # type (see schema.py); after imputation the whole column has that type
+    floats = [dtype for dtype in dtypes if dtype.kind == 'f']
+    return np.result_type(*(floats or dtypes))
+
+def apply_cleaning(chunk, stats):
+    chunk = _fill_missing(chunk, {**stats['means'], **stats['modes']})
+    for column, categories in stats['categories'].items():
+        if column in chunk.columns:
+            chunk[column] = pd.Categorical(_category_values(chunk[column]), categories=categories)
+    encoded = pd.get_dummies(chunk, drop_first=True)
+    dtypes = stats.get('dtypes')
+    if dtypes:
+        encoded = encoded[list(dtypes)].astype(dtypes)
+    return encoded
+
+@instrument()
+def clean_in_chunks(input_path, output_path, chunksize=100000, stats=None):
+    if stats is None:
+        stats = collect_cleaning_stats(input_path, chunksize=chunksize)
+    cleaned = (apply_cleaning(chunk, stats)
+               for chunk in iter_frames(input_path, chunksize=chunksize))
+    n_rows = write_frames(cleaned, output_path, dtypes=stats.get('dtypes'))
+    print(f"Cleaned {n_rows} rows into: {output_path}")
+    return stats
+
+def _is_numeric(series):
+    # Bool columns (e.g. the purchased target) pass through like numbers, as
+    # get_dummies leaves them alone in the in-memory path
+    return pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)
 
 # Example usage:
 # df = load_data('data/raw_data.csv')
 # df = handle_missing_values(df)
 # df = encode_categorical_variables(df)
-# save_cleaned_data(df, 'data/cleaned_data.csv')
\ No newline at end of file
+# save_cleaned_data(df, 'data/cleaned_data.csv')
+#
+# Files larger than memory:
+# clean_in_chunks('data/raw_data.csv', 'data/cleaned_data.csv', chunksize=100000)
\ No newline at end of file
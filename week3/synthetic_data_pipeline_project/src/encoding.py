@@ -0,0 +1,158 @@
+"""
+Fitted categorical encoder for consistent train/serve feature layouts.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .paths import MODELS_DIR
+except ImportError:
+    from paths import MODELS_DIR
+
+DEFAULT_ENCODER_PATH = os.path.join(MODELS_DIR, 'categorical_encoder.joblib')
+# Registry name under which ModelTrainer saves the encoder of its models
+ENCODER_NAME = 'categorical_encoder'
+
+
+class CategoricalEncoder:
+    """Records category vocabularies and encodes frames against them.
+
+    Every categorical column gets one slot per known category plus a
+    reserved last slot for unseen or missing values, so the output layout
+    never depends on which categories appear in a batch. ModelTrainer fits
+    one when the features have categorical columns and registers it with
+    the models; scoring.load_encoder finds it again for serving.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns
+        self.categories_ = None
+        self.passthrough_ = None
+
+    def fit(self, df, target_col=None):
+        """Learn the vocabulary of each categorical column.
+
+        target_col is neither encoded nor passed through, so frames without
+        it (e.g. serving requests) can be transformed.
+        """
+        features = [col for col in df.columns if col != target_col]
+        columns = self.columns
+        if columns is None:
+            columns = [col for col in features
+                       if not pd.api.types.is_numeric_dtype(df[col])
+                       and not pd.api.types.is_bool_dtype(df[col])]
+        columns = [col for col in columns if col != target_col]
+        self.categories_ = {col: sorted(df[col].dropna().unique().tolist()) for col in columns}
+        self.passthrough_ = [col for col in features if col not in self.categories_]
+        return self
+
+    def partial_fit(self, df):
+        """Add the categories of another chunk to the learned vocabularies.
+
+        Which columns are categorical is fixed by the first fit.
+        """
+        if self.categories_ is None:
+            return self.fit(df)
+        for col, categories in self.categories_.items():
+            if col in df.columns:
+                new = set(df[col].dropna().unique().tolist()) - set(categories)
+                if new:
+                    self.categories_[col] = sorted(set(categories) | new)
+        return self
+
+    def _check_fitted(self):
+        if self.categories_ is None:
+            raise ValueError("CategoricalEncoder is not fitted yet. Call fit() first.")
+
+    def _codes(self, series, categories):
+        codes = pd.Categorical(series, categories=categories).codes.astype(np.int32)
+        # -1 (unseen or missing) goes to the reserved slot
+        codes[codes < 0] = len(categories)
+        return codes
+
+    def get_input_names(self):
+        """Columns transform() reads: passthrough then categorical."""
+        self._check_fitted()
+        return list(self.passthrough_) + list(self.categories_)
+
+    def get_feature_names(self):
+        """Column names of the one-hot output, in order."""
+        self._check_fitted()
+        names = list(self.passthrough_)
+        for col, categories in self.categories_.items():
+            names += [f"{col}_{value}" for value in categories] + [f"{col}__unknown"]
+        return names
+
+    def transform(self, df, output='sparse'):
+        """Encode df.
+
+        output='sparse' returns a CSR matrix (passthrough columns then
+        one-hot blocks), 'dense' the same as a DataFrame, and 'codes' a
+        DataFrame with each categorical column replaced by int32 codes.
+        """
+        self._check_fitted()
+        if output == 'codes':
+            encoded = df.copy()
+            for col, categories in self.categories_.items():
+                encoded[col] = self._codes(df[col], categories)
+            return encoded
+        if output not in ('sparse', 'dense'):
+            raise ValueError(f"Unknown output '{output}'. Use 'sparse', 'dense' or 'codes'.")
+
+        n_rows = len(df)
+        from scipy import sparse
+
+        blocks = [sparse.csr_matrix(df[self.passthrough_].to_numpy(dtype=float))]
+        rows = np.arange(n_rows)
+        for col, categories in self.categories_.items():
+            block = sparse.csr_matrix(
+                (np.ones(n_rows), (rows, self._codes(df[col], categories))),
+                shape=(n_rows, len(categories) + 1)
+            )
+            blocks.append(block)
+        matrix = sparse.hstack(blocks, format='csr')
+
+        if output == 'sparse':
+            return matrix
+        return pd.DataFrame(matrix.toarray(), columns=self.get_feature_names(), index=df.index)
+
+    def fit_transform(self, df, output='sparse', target_col=None):
+        return self.fit(df, target_col=target_col).transform(df, output=output)
+
+    def save(self, path=DEFAULT_ENCODER_PATH):
+        """Save next to the model artifacts."""
+        self._check_fitted()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        import joblib
+        joblib.dump(self, path)
+        print(f"Saved encoder: {path}")
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_ENCODER_PATH):
+        import joblib
+        return joblib.load(path)
+
+
+def output_for(model):
+    """'sparse' if model fits and predicts on a CSR matrix as is, else 'dense'.
+
+    LogisticRegression, SGDClassifier and RandomForestClassifier take the
+    sparse one-hot output directly. A Pipeline qualifies only if every step
+    does; a centering StandardScaler needs dense input.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    model = getattr(model, 'model', model)  # unwrap a registry LazyModel
+    steps = [step for _, step in model.steps] if isinstance(model, Pipeline) else [model]
+    for step in steps:
+        if isinstance(step, StandardScaler) and not step.with_mean:
+            continue
+        if not isinstance(step, (LogisticRegression, SGDClassifier, RandomForestClassifier)):
+            return 'dense'
+    return 'sparse'
@@ -0,0 +1,136 @@
+"""
+Shared, non-blocking error log.
+
+Callers only put a formatted line on a queue. A background thread drains
+the queue in batches into logs/errors.txt (or PIPELINE_LOG_DIR), keeps the
+file open between batches, rotates it by size and flushes on exit.
+"""
+import atexit
+import os
+import queue
+import threading
+from datetime import datetime
+
+try:
+    from .paths import LOGS_DIR
+except ImportError:
+    from paths import LOGS_DIR
+
+_STOP = object()
+
+
+class ErrorLogger:
+    """Queue-backed log writer with size-based rotation."""
+
+    def __init__(self, log_dir=None, filename='errors.txt', max_bytes=10 * 1024 ** 2,
+                 backup_count=5, batch_size=1000, flush_interval=0.5):
+        log_dir = log_dir or os.environ.get('PIPELINE_LOG_DIR') or LOGS_DIR
+        self.path = os.path.join(os.path.abspath(log_dir), filename)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._file = None
+
+    def log(self, message, level='ERROR'):
+        """Queue one message; never touches the file system in the caller."""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._ensure_started()
+        self._queue.put(f"[{timestamp}] {level}: {message}\n")
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far is on disk."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        """Flush, stop the writer thread and close the file."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='error-log-writer',
+                                                daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [item for item in batch if isinstance(item, str)]
+            if lines:
+                self._write(lines)
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if any(item is _STOP for item in batch):
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, lines):
+        try:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, 'a')
+            self._file.write(''.join(lines))
+            self._file.flush()
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            print(f"Failed to write to log file: {e}")
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def get_error_logger():
+    """The process-wide ErrorLogger, created on first use."""
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                _logger = ErrorLogger()
+                atexit.register(_logger.close)
+    return _logger
+
+
+def log_error(message):
+    """Queue an error message on the shared logger."""
+    get_error_logger().log(message)
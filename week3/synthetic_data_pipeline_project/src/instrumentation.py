@@ -0,0 +1,205 @@
+"""
+Lightweight instrumentation for pipeline stages.
+
+Decorate a function with @instrument() (or wrap a block in
+stage_timer(name)) to record wall time, CPU time, rows processed, rows/s
+and the tracemalloc peak as one JSON line per call. When instrumentation
+is disabled the decorator costs a single flag check.
+
+tracemalloc is process-wide, so memory is only traced while a single
+thread is inside instrumented stages. Stages that overlap with a stage on
+another thread (e.g. parallel branches of the pipeline DAG) report
+peak_mb as null instead of a peak mixed with the other thread's
+allocations.
+
+Enable from code with configure(enabled=True, sink='results/stages.jsonl')
+or from the environment:
+    PIPELINE_INSTRUMENT=1
+    PIPELINE_INSTRUMENT_SINK=/path/to/stages.jsonl   (default: stderr)
+    PIPELINE_PROFILE_DIR=/path/to/profiles           (optional cProfile dumps)
+"""
+import cProfile
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class _State:
+    enabled = False
+    sink = None
+    profile_dir = None
+    trace_memory = True
+    lock = threading.Lock()
+    local = threading.local()
+    active_threads = 0   # threads currently inside an instrumented stage
+    overlaps = 0         # times a thread entered while another was active
+
+
+_state = _State()
+
+
+def configure(enabled=True, sink=None, profile_dir=None, trace_memory=True):
+    """Turn instrumentation on or off.
+
+    sink is a file path (appended to) or a writable text stream; records go
+    to stderr when it is None. profile_dir, when set, gets one cProfile
+    .prof file per outermost instrumented call.
+    """
+    _state.enabled = enabled
+    _state.sink = sink
+    _state.profile_dir = profile_dir
+    _state.trace_memory = trace_memory
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+
+
+def is_enabled():
+    return _state.enabled
+
+
+def _emit(record):
+    line = json.dumps(record, default=str) + "\n"
+    sink = _state.sink
+    with _state.lock:
+        if sink is None:
+            sys.stderr.write(line)
+        elif isinstance(sink, str):
+            with open(sink, "a") as f:
+                f.write(line)
+        else:
+            sink.write(line)
+
+
+def _count_rows(value):
+    if hasattr(value, "shape") and getattr(value, "shape", None):
+        return int(value.shape[0])
+    # A tuple is several return values, e.g. (X, y): count the first one
+    if isinstance(value, tuple):
+        return _count_rows(value[0]) if value else None
+    if isinstance(value, list):
+        return len(value)
+    return None
+
+
+@contextmanager
+def stage_timer(name, rows=None):
+    """Time a block. Set record['rows'] inside the block if rows is not known upfront."""
+    record = {"stage": name, "rows": rows}
+    if not _state.enabled:
+        yield record
+        return
+
+    depth = getattr(_state.local, "depth", 0)
+    _state.local.depth = depth + 1
+    started_tracing = trace = False
+    with _state.lock:
+        if depth == 0:
+            _state.active_threads += 1
+            if _state.active_threads > 1:
+                _state.overlaps += 1
+        overlaps = _state.overlaps
+        # Only touch tracemalloc while this is the only thread in a stage
+        if _state.trace_memory and _state.active_threads == 1:
+            if depth == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            trace = tracemalloc.is_tracing()
+
+    # Nested stages share tracemalloc; the stack keeps outer peaks correct
+    stack = getattr(_state.local, "peaks", None)
+    if stack is None:
+        stack = _state.local.peaks = []
+    if trace:
+        if stack and not started_tracing:
+            stack[-1] = max(stack[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        stack.append(0)
+
+    # Only the outermost stage of a thread is profiled
+    profiler = None
+    if _state.profile_dir and depth == 0:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    status = "ok"
+    try:
+        yield record
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        _state.local.depth = depth
+        if profiler is not None:
+            profiler.disable()
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            profiler.dump_stats(os.path.join(_state.profile_dir, f"{name}-{stamp}.prof"))
+
+        peak_mb = None
+        if trace:
+            peak = max(stack.pop(), tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1] = max(stack[-1], peak)
+            # Another thread ran a stage meanwhile: the peak includes its memory
+            if _state.overlaps == overlaps:
+                peak_mb = peak / 1e6
+        with _state.lock:
+            # Stop before leaving, so a thread entering next can start its own trace
+            if started_tracing:
+                tracemalloc.stop()
+            if depth == 0:
+                _state.active_threads -= 1
+
+        rows = record.get("rows")
+        _emit({
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "stage": name,
+            "status": status,
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "rows": rows,
+            "rows_per_s": round(rows / wall, 1) if rows and wall > 0 else None,
+            "peak_mb": round(peak_mb, 3) if peak_mb is not None else None,
+        })
+
+
+def instrument(name=None, rows=None):
+    """Decorator recording a stage_timer record per call.
+
+    Rows default to the length of the returned DataFrame/array, falling
+    back to the first DataFrame-like argument. rows may also be a callable
+    taking (result, args, kwargs).
+    """
+    def decorator(func):
+        stage = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            with stage_timer(stage) as record:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    record["rows"] = rows(result, args, kwargs)
+                else:
+                    record["rows"] = _count_rows(result)
+                    if record["rows"] is None:
+                        record["rows"] = next((n for n in map(_count_rows, args) if n), None)
+            return result
+
+        return wrapper
+    return decorator
+
+
+if os.environ.get("PIPELINE_INSTRUMENT", "").lower() in ("1", "true", "yes"):
+    configure(enabled=True,
+              sink=os.environ.get("PIPELINE_INSTRUMENT_SINK") or None,
+              profile_dir=os.environ.get("PIPELINE_PROFILE_DIR") or None)
@@ -0,0 +1,188 @@
+"""
+Versioned model artifacts with metadata and lazy, memory-mapped loading.
+
+Layout under the registry root (models/ by default):
+    <name>/v0001/model.joblib
+    <name>/v0001/metadata.json   metrics, data hash, feature schema, compression, ...
+
+Uncompressed artifacts are loaded with mmap_mode='r': NumPy arrays the
+model holds as plain attributes (e.g. linear coefficients, or the node
+arrays of a numpy_inference.ForestScorer) stay in the OS page cache and are
+shared by every process that loads the same version. sklearn trees are an
+exception: Tree.__setstate__ copies its node arrays, so every process holds
+its own copy of a RandomForestClassifier; register its
+export_model(keep_forest=False) scorer to share a forest. Compressed
+artifacts are smaller on disk but are read fully into each process.
+get() returns a LazyModel that only loads the artifact when it is first
+used.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+
+try:
+    from .error_log import log_error
+    from .paths import MODELS_DIR
+except ImportError:
+    from error_log import log_error
+    from paths import MODELS_DIR
+
+MODEL_FILE = 'model.joblib'
+METADATA_FILE = 'metadata.json'
+
+
+class ModelNotFoundError(Exception):
+    """Raised when a model name or version is not in the registry."""
+    pass
+
+
+class LazyModel:
+    """Stands in for a registered model and loads it on first attribute access.
+
+    feature_names_in_ and metadata are answered from metadata.json, so
+    setting up a scorer does not load the model.
+    """
+
+    def __init__(self, registry, name, version, mmap_mode='r'):
+        self.registry = registry
+        self.name = name
+        self.version = version
+        self.mmap_mode = mmap_mode
+        self.metadata = registry.metadata(name, version)
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._model is not None
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self.registry.load(self.name, self.version, self.mmap_mode)
+        return self._model
+
+    @property
+    def feature_names_in_(self):
+        features = self.metadata.get('features')
+        if features is None:
+            return getattr(self.model, 'feature_names_in_')
+        return list(features)
+
+    def __getattr__(self, attr):
+        # Only called for attributes not found on the proxy itself; 'model' lands
+        # here when loading raised AttributeError, which must not recurse
+        if attr.startswith('__') or attr in ('model', '_model'):
+            raise AttributeError(attr)
+        return getattr(self.model, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f"LazyModel({self.name!r}, version={self.version}, {state})"
+
+
+class ModelRegistry:
+    """Stores each saved model as a new numbered version."""
+
+    def __init__(self, root=MODELS_DIR):
+        self.root = root
+
+    def _version_dir(self, name, version):
+        return os.path.join(self.root, name, f"v{version:04d}")
+
+    def versions(self, name):
+        """Sorted version numbers of name (complete artifacts only)."""
+        model_dir = os.path.join(self.root, name)
+        if not os.path.isdir(model_dir):
+            return []
+        versions = []
+        for entry in os.listdir(model_dir):
+            if entry.startswith('v') and entry[1:].isdigit() and os.path.isfile(
+                    os.path.join(model_dir, entry, METADATA_FILE)):
+                versions.append(int(entry[1:]))
+        return sorted(versions)
+
+    def names(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)) and self.versions(name))
+
+    def _resolve(self, name, version=None):
+        versions = self.versions(name)
+        if not versions or (version is not None and version not in versions):
+            error_msg = f"Model '{name}' version {version or 'latest'} not found in {self.root}"
+            log_error(error_msg)
+            raise ModelNotFoundError(error_msg)
+        return versions[-1] if version is None else version
+
+    def register(self, name, model, metrics=None, data_hash=None, features=None, compress=0,
+                 extra=None):
+        """Save model as the next version of name and return that version.
+
+        compress is passed to joblib.dump: 0 keeps the artifact
+        memory-mappable, an int 1-9 or a (method, level) tuple such as
+        ('lz4', 3) trades load time and sharing for disk space.
+        """
+        import joblib
+
+        os.makedirs(os.path.join(self.root, name), exist_ok=True)
+        tmp = os.path.join(self.root, name, f".tmp-{os.getpid()}-{threading.get_ident()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        model_path = os.path.join(tmp, MODEL_FILE)
+        joblib.dump(model, model_path, compress=compress)
+
+        metadata = {
+            'name': name,
+            'class': type(model).__name__,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'compress': compress,
+            'mmap': not compress,
+            'size_bytes': os.path.getsize(model_path),
+            'metrics': metrics or {},
+            'data_hash': data_hash,
+            'features': features,
+        }
+        metadata.update(extra or {})
+
+        # Claim the next free version; a rename onto an existing one fails
+        while True:
+            version = (self.versions(name) or [0])[-1] + 1
+            metadata['version'] = version
+            with open(os.path.join(tmp, METADATA_FILE), 'w') as f:
+                json.dump(metadata, f, indent=2, default=str)
+            try:
+                os.rename(tmp, self._version_dir(name, version))
+                return version
+            except OSError:
+                if not os.path.isdir(self._version_dir(name, version)):
+                    shutil.rmtree(tmp, ignore_errors=True)
+                    raise
+
+    def metadata(self, name, version=None):
+        version = self._resolve(name, version)
+        with open(os.path.join(self._version_dir(name, version), METADATA_FILE)) as f:
+            return json.load(f)
+
+    def path(self, name, version=None):
+        return os.path.join(self._version_dir(name, self._resolve(name, version)), MODEL_FILE)
+
+    def load(self, name, version=None, mmap_mode='r'):
+        """Load a model now. mmap_mode is ignored for compressed artifacts;
+        pass mmap_mode=None when the model will be modified (e.g. partial_fit)."""
+        import joblib
+
+        version = self._resolve(name, version)
+        if self.metadata(name, version).get('compress'):
+            mmap_mode = None
+        return joblib.load(os.path.join(self._version_dir(name, version), MODEL_FILE),
+                           mmap_mode=mmap_mode)
+
+    def get(self, name, version=None, mmap_mode='r'):
+        """A LazyModel for name (latest version by default)."""
+        return LazyModel(self, name, self._resolve(name, version), mmap_mode)
@@ -1,40 +1,253 @@
 import os
-import joblib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import Pipeline
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, roc_auc_score
+
+try:
+    from .error_log import log_error
+    from .cache import FileRef, hash_data
+    from .encoding import ENCODER_NAME, CategoricalEncoder, output_for
+    from .instrumentation import instrument
+    from .model_registry import ModelRegistry
+    from .paths import MODELS_DIR, PROCESSED_DATA_DIR, RESULTS_DIR
+    from .storage import iter_frames, load_frame
+except ImportError:
+    from error_log import log_error
+    from cache import FileRef, hash_data
+    from encoding import ENCODER_NAME, CategoricalEncoder, output_for
+    from instrumentation import instrument
+    from model_registry import ModelRegistry
+    from paths import MODELS_DIR, PROCESSED_DATA_DIR, RESULTS_DIR
+    from storage import iter_frames, load_frame
+
+METRIC_NAMES = ["accuracy", "precision", "recall", "f1", "roc_auc"]
+
+# sklearn and joblib are imported where they are used: they dominate the
+# import time of this module and most callers never train a model.
+
+def make_models(random_state=42, n_jobs=-1):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    # Logistic Regression with scaling
+    logreg = Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", LogisticRegression(max_iter=1000, random_state=random_state))
+    ])
+    rf = RandomForestClassifier(
+        n_estimators=200,
+        random_state=random_state,
+        n_jobs=n_jobs
+    )
+    return {
+        "logistic_regression": logreg,
+        "random_forest": rf
+    }
+
+def make_search_spaces(random_state=42, cache_dir=None):
+    """Per model: estimator, parameter distributions and the halving resource.
+
+    Logistic regression trials grow the training subsample (n_samples);
+    random forest trials grow the number of trees. min_resources="exhaust"
+    sizes the first round so the last one runs at max_resources (all
+    training rows, 400 trees). The scaler step is
+    cached in cache_dir, so trials that see the same fold subsample reuse
+    the fitted scaler instead of refitting it.
+    """
+    from scipy.stats import loguniform
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    logreg = Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", LogisticRegression(max_iter=1000, random_state=random_state))
+    ], memory=cache_dir)
+    rf = RandomForestClassifier(random_state=random_state, n_jobs=1)
+    return {
+        "logistic_regression": {
+            "estimator": logreg,
+            "params": {
+                "clf__C": loguniform(1e-3, 1e2),
+                "clf__class_weight": [None, "balanced"],
+            },
+            "resource": "n_samples",
+            "min_resources": "exhaust",
+            "max_resources": "auto",
+        },
+        "random_forest": {
+            "estimator": rf,
+            "params": {
+                "max_depth": [None, 5, 10, 20],
+                "min_samples_leaf": [1, 2, 5, 10],
+                "max_features": ["sqrt", "log2", 0.5],
+            },
+            "resource": "n_estimators",
+            "min_resources": "exhaust",
+            "max_resources": 400,
+        },
+    }
+
+def _format_params(params):
+    return str({key: value.item() if hasattr(value, "item") else value
+                for key, value in params.items()})
+
+INCREMENTAL_MODEL = "sgd_logistic_regression"
+
+def make_incremental_model(random_state=42):
+    # Logistic regression fit by SGD; both steps support partial_fit
+    from sklearn.linear_model import SGDClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", SGDClassifier(loss="log_loss", alpha=1e-4, random_state=random_state))
+    ])
+
+def compute_metrics(y_test, y_pred, y_prob):
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+    return {
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred, zero_division=0),
+        "recall": recall_score(y_test, y_pred, zero_division=0),
+        "f1": f1_score(y_test, y_pred, zero_division=0),
+        "roc_auc": roc_auc_score(y_test, y_prob)
+    }
+
+def register_model(registry, name, model, metrics=(), data_info=None, compress=0, source=None,
+                   encoder_version=None):
+    """Register model as the next version of name with its metrics row and data info.
+
+    encoder_version points at the registered CategoricalEncoder the model's
+    inputs have to go through (see register_encoder).
+    """
+    data_info = data_info or {}
+    row = next((m for m in metrics if m.get("model") == name), {})
+    extra = {"n_rows": data_info.get("n_rows"), "source": source}
+    if encoder_version is not None:
+        extra["encoder_version"] = encoder_version
+    version = registry.register(
+        name, model,
+        metrics={k: v for k, v in row.items() if k != "model"},
+        data_hash=data_info.get("data_hash"),
+        features=data_info.get("features"),
+        compress=compress,
+        extra=extra)
+    print(f"Saved model: {registry.path(name, version)}")
+    return version
+
+def register_encoder(registry, encoder, data_info=None):
+    """Register a fitted CategoricalEncoder next to the models and return its version."""
+    data_info = data_info or {}
+    version = registry.register(ENCODER_NAME, encoder, data_hash=data_info.get("data_hash"),
+                                features=data_info.get("features"))
+    print(f"Saved encoder: {registry.path(ENCODER_NAME, version)}")
+    return version
+
+def write_metrics(metrics, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, "metrics.csv")
+    pd.DataFrame(metrics).to_csv(path, index=False)
+    print(f"Saved metrics: {path}")
+    return path
+
+def _fit_fold(task):
+    # Runs in a worker process: X and y are memory-mapped, not pickled
+    name, fold, data_dir, train_idx, test_idx, random_state = task
+    X = np.load(os.path.join(data_dir, "X.npy"), mmap_mode="r")
+    y = np.load(os.path.join(data_dir, "y.npy"), mmap_mode="r")
+    # One core per fit; parallelism comes from running folds side by side
+    model = make_models(random_state, n_jobs=1)[name]
+    model.fit(X[train_idx], y[train_idx])
+    X_test, y_test = X[test_idx], y[test_idx]
+    m = {"model": name, "fold": fold}
+    m.update(compute_metrics(y_test, model.predict(X_test), model.predict_proba(X_test)[:, 1]))
+    return m
 
 class ModelTrainer:
     def __init__(self,
                  data_path=None,
                  target_col='purchased',
                  test_size=0.2,
-                 random_state=42):
+                 random_state=42,
+                 feature_cols=None,
+                 models_dir=MODELS_DIR,
+                 results_dir=RESULTS_DIR,
+                 data=None,
+                 compress=0):
+        # An in-memory DataFrame (e.g. from the pipeline) skips file loading
+        self.data = data
         # Prefer augmented dataset if it exists
-        if data_path is None:
-            aug_path = 'data/processed/augmented_data.csv'
-            clean_path = 'data/processed/cleaned_data.csv'
+        if data_path is None and data is None:
+            aug_path = os.path.join(PROCESSED_DATA_DIR, 'augmented_data.csv')
+            clean_path = os.path.join(PROCESSED_DATA_DIR, 'cleaned_data.csv')
             data_path = aug_path if os.path.isfile(aug_path) else clean_path
         self.data_path = data_path
         self.target_col = target_col
+        # Only these columns (plus the target) are read when set
+        self.feature_cols = feature_cols
         self.test_size = test_size
         self.random_state = random_state
+        self.models_dir = models_dir
+        self.results_dir = results_dir
+        # Models are saved as versions in a registry under models_dir;
+        # compress=0 keeps them memory-mappable (see model_registry)
+        self.registry = ModelRegistry(models_dir)
+        self.compress = compress
         self.models = {}
         self.metrics = []
+        # Data hash and feature schema recorded with every saved model
+        self.data_info = {}
+        # Fitted on the categorical feature columns, if there are any
+        self.encoder = None
+        self.encoder_version = None
 
+    @instrument()
     def load_data(self):
-        df = pd.read_csv(self.data_path)
+        columns = None
+        if self.feature_cols is not None:
+            columns = list(self.feature_cols) + [self.target_col]
+        if self.data is not None:
+            df = self.data if columns is None else self.data[columns]
+        else:
+            df = load_frame(self.data_path, columns=columns)
         if self.target_col not in df.columns:
-            raise ValueError(f"Target column '{self.target_col}' not found.")
+            error_msg = f"Target column '{self.target_col}' not found."
+            log_error(error_msg)
+            raise ValueError(error_msg)
         X = df.drop(columns=[self.target_col])
         y = df[self.target_col]
-        return X, y
+        self.data_info = {
+            "data_hash": hash_data(df).hexdigest(),
+            "features": {col: str(dtype) for col, dtype in X.dtypes.items()},
+            "n_rows": len(df),
+        }
+        return self._encode(X), y
+
+    def _encode(self, X):
+        # Categorical columns are one-hot encoded by a fitted encoder that is
+        # registered with the models, so scoring sees the same layout
+        self.encoder, self.encoder_version = None, None
+        encoder = CategoricalEncoder().fit(X, target_col=self.target_col)
+        if not encoder.categories_:
+            return X
+        self.encoder = encoder
+        # Kept as CSR; _model_input densifies it only for models that need it
+        return encoder.transform(X, output='sparse')
+
+    def _model_input(self, model, X):
+        # Densify the CSR features for models that need a frame; model=None always does
+        if not hasattr(X, 'toarray') or (model is not None and output_for(model) == 'sparse'):
+            return X
+        return pd.DataFrame(X.toarray(), columns=self.encoder.get_feature_names())
 
     def split(self, X, y):
+        from sklearn.model_selection import train_test_split
         return train_test_split(
             X, y,
             test_size=self.test_size,
@@ -43,22 +256,10 @@ class ModelTrainer:
         )
 
     def build_models(self):
-        # Logistic Regression with scaling
-        logreg = Pipeline([
-            ("scaler", StandardScaler()),
-            ("clf", LogisticRegression(max_iter=1000, random_state=self.random_state))
-        ])
-        rf = RandomForestClassifier(
-            n_estimators=200,
-            random_state=self.random_state,
-            n_jobs=-1
-        )
-        self.models = {
-            "logistic_regression": logreg,
-            "random_forest": rf
-        }
+        self.models = make_models(self.random_state)
 
     def evaluate(self, name, model, X_test, y_test):
+        X_test = self._model_input(model, X_test)
         y_pred = model.predict(X_test)
         # Some models use predict_proba, others decision_function
         if hasattr(model, "predict_proba"):
@@ -66,39 +267,46 @@ class ModelTrainer:
         else:
             # Fallback (not expected here)
             y_prob = y_pred
-        m = {
-            "model": name,
-            "accuracy": accuracy_score(y_test, y_pred),
-            "precision": precision_score(y_test, y_pred, zero_division=0),
-            "recall": recall_score(y_test, y_pred, zero_division=0),
-            "f1": f1_score(y_test, y_pred, zero_division=0),
-            "roc_auc": roc_auc_score(y_test, y_prob)
-        }
+        m = {"model": name}
+        m.update(compute_metrics(y_test, y_pred, y_prob))
         self.metrics.append(m)
         print(f"{name}: acc={m['accuracy']:.4f} prec={m['precision']:.4f} "
               f"rec={m['recall']:.4f} f1={m['f1']:.4f} auc={m['roc_auc']:.4f}")
 
+    def _register(self, name, model):
+        if self.encoder is not None and self.encoder_version is None:
+            self.encoder_version = register_encoder(self.registry, self.encoder, self.data_info)
+        return register_model(self.registry, name, model, self.metrics, self.data_info,
+                              compress=self.compress, source=str(self._source()),
+                              encoder_version=self.encoder_version)
+
+    @instrument()
     def save_models(self):
-        os.makedirs("models", exist_ok=True)
         for name, model in self.models.items():
-            path = f"models/{name}.joblib"
-            joblib.dump(model, path)
-            print(f"Saved model: {path}")
+            self._register(name, model)
 
     def save_metrics(self):
-        os.makedirs("results", exist_ok=True)
-        df_metrics = pd.DataFrame(self.metrics)
-        df_metrics.to_csv("results/metrics.csv", index=False)
-        print("Saved metrics: results/metrics.csv")
+        write_metrics(self.metrics, self.results_dir)
 
-    def run(self):
-        print(f"Loading data from: {self.data_path}")
+    def _source(self):
+        return "in-memory DataFrame" if self.data is not None else self.data_path
+
+    @instrument(rows=lambda result, args, kwargs: args[0].data_info.get("n_rows"))
+    def train(self):
+        # Fit and evaluate without writing any artifacts
+        print(f"Loading data from: {self._source()}")
         X, y = self.load_data()
         X_train, X_test, y_train, y_test = self.split(X, y)
         self.build_models()
+        self.metrics = []
         for name, model in self.models.items():
-            model.fit(X_train, y_train)
+            model.fit(self._model_input(model, X_train), y_train)
             self.evaluate(name, model, X_test, y_test)
+        return self.models, self.metrics
+
+    @instrument(rows=lambda result, args, kwargs: args[0].data_info.get("n_rows"))
+    def run(self):
+        self.train()
         self.save_models()
         self.save_metrics()
         # Return best model name by F1 (can adjust if preferred)
@@ -106,6 +314,269 @@ class ModelTrainer:
         print(f"Best model by F1: {best['model']}")
         return best
 
+    @instrument()
+    def run_cv(self, n_splits=5, n_jobs=None):
+        """Stratified k-fold evaluation with every (model, fold) fit in parallel.
+
+        The feature matrix is written once to a temporary .npy file and
+        memory-mapped by the workers. Per-fold metrics go to
+        results/cv_fold_metrics.csv and their mean/std to results/metrics.csv.
+        """
+        from sklearn.model_selection import StratifiedKFold
+
+        print(f"Loading data from: {self._source()}")
+        X, y = self.load_data()
+        folds = StratifiedKFold(n_splits=n_splits, shuffle=True,
+                                random_state=self.random_state).split(X, y)
+        folds = list(folds)
+        names = list(make_models(self.random_state))
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            np.save(os.path.join(data_dir, "X.npy"), self._model_input(None, X).to_numpy(dtype=float))
+            np.save(os.path.join(data_dir, "y.npy"), y.to_numpy())
+            tasks = [(name, fold, data_dir, train_idx, test_idx, self.random_state)
+                     for name in names
+                     for fold, (train_idx, test_idx) in enumerate(folds)]
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                fold_metrics = pd.DataFrame(list(executor.map(_fit_fold, tasks)))
+
+        summary = fold_metrics.groupby("model", sort=False)[METRIC_NAMES].agg(["mean", "std"])
+        summary.columns = [f"{metric}_{stat}" for metric, stat in summary.columns]
+        summary = summary.reset_index()
+        for _, row in summary.iterrows():
+            print(f"{row['model']}: " + " ".join(
+                f"{metric}={row[metric + '_mean']:.4f}±{row[metric + '_std']:.4f}"
+                for metric in METRIC_NAMES))
+
+        os.makedirs(self.results_dir, exist_ok=True)
+        fold_path = os.path.join(self.results_dir, "cv_fold_metrics.csv")
+        fold_metrics.to_csv(fold_path, index=False)
+        print(f"Saved fold metrics: {fold_path}")
+        self.metrics = summary.to_dict("records")
+        self.save_metrics()
+
+        best = max(self.metrics, key=lambda d: d["f1_mean"])
+        print(f"Best model by mean F1: {best['model']}")
+        return best
+
+    @instrument()
+    def run_search(self, n_candidates=16, factor=3, cv=3, scoring="f1", n_jobs=-1):
+        """Successive-halving random search over make_search_spaces.
+
+        Each round keeps the best 1/factor of the candidates and gives them
+        factor times more resource (rows or trees); trials run in parallel.
+        Every trial goes to results/search_leaderboard.csv. The tuned
+        models are refit and scored on the same held-out split; the one with
+        the best held-out score is registered as best_model (cv scores of
+        the two searches come from different resource levels and are not
+        compared).
+        """
+        from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+        from sklearn.metrics import get_scorer
+        from sklearn.model_selection import HalvingRandomSearchCV
+
+        print(f"Loading data from: {self._source()}")
+        X, y = self.load_data()
+        X_train, X_test, y_train, y_test = self.split(X, y)
+
+        leaderboard, searches = [], {}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            spaces = make_search_spaces(self.random_state, cache_dir=cache_dir)
+            for name, space in spaces.items():
+                search = HalvingRandomSearchCV(
+                    space["estimator"], space["params"],
+                    n_candidates=n_candidates, factor=factor, cv=cv, scoring=scoring,
+                    resource=space["resource"], min_resources=space["min_resources"],
+                    max_resources=space["max_resources"],
+                    random_state=self.random_state, n_jobs=n_jobs)
+                search.fit(self._model_input(space["estimator"], X_train), y_train)
+                searches[name] = search
+                results = pd.DataFrame(search.cv_results_)
+                leaderboard.append(pd.DataFrame({
+                    "model": name,
+                    "iteration": results["iter"],
+                    "n_resources": results["n_resources"],
+                    "params": results["params"].map(_format_params),
+                    f"mean_{scoring}": results["mean_test_score"],
+                    f"std_{scoring}": results["std_test_score"],
+                }))
+                print(f"{name}: best cv {scoring}={search.best_score_:.4f} "
+                      f"with {_format_params(search.best_params_)} ({len(results)} trials)")
+                # Keep the fitted model, not the temporary cache directory
+                if hasattr(search.best_estimator_, "memory"):
+                    search.best_estimator_.set_params(memory=None)
+
+        leaderboard = pd.concat(leaderboard, ignore_index=True).sort_values(
+            ["iteration", f"mean_{scoring}"], ascending=False)
+        os.makedirs(self.results_dir, exist_ok=True)
+        board_path = os.path.join(self.results_dir, "search_leaderboard.csv")
+        leaderboard.to_csv(board_path, index=False)
+        print(f"Saved leaderboard: {board_path}")
+
+        self.metrics, test_scores = [], {}
+        for name, search in searches.items():
+            self.evaluate(name, search.best_estimator_, X_test, y_test)
+            X_eval = self._model_input(search.best_estimator_, X_test)
+            test_scores[name] = float(get_scorer(scoring)(search.best_estimator_, X_eval, y_test))
+            self.metrics[-1]["test_" + scoring] = test_scores[name]
+            self.metrics[-1]["cv_" + scoring] = float(search.best_score_)
+            self.metrics[-1]["params"] = _format_params(search.best_params_)
+        self.save_metrics()
+
+        best_name = max(test_scores, key=test_scores.get)
+        self.models = {name: search.best_estimator_ for name, search in searches.items()}
+        print(f"Best model by held-out {scoring}: {best_name}")
+        best = next(m for m in self.metrics if m["model"] == best_name)
+        self.metrics.append({**best, "model": "best_model", "base_model": best_name})
+        self._register("best_model", self.models[best_name])
+        return best
+
+    def _iter_chunks(self, chunksize):
+        columns = None
+        if self.feature_cols is not None:
+            columns = list(self.feature_cols) + [self.target_col]
+        if self.data is None:
+            yield from iter_frames(self.data_path, chunksize=chunksize, columns=columns)
+            return
+        df = self.data if columns is None else self.data[columns]
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+
+    def _fit_stream_encoder(self, chunksize):
+        # One pass over the data so categories first seen in a late chunk
+        # get their own column; None when there are no categorical columns
+        encoder = None
+        for chunk in self._iter_chunks(chunksize):
+            if encoder is None:
+                encoder = CategoricalEncoder().fit(chunk, target_col=self.target_col)
+                if not encoder.categories_:
+                    return None
+            else:
+                encoder.partial_fit(chunk)
+        return encoder
+
+    def _registered_encoder(self, name):
+        # (encoder, version) a registered model was trained with, or (None, None)
+        version = self.registry.metadata(name).get("encoder_version")
+        if version is None:
+            return None, None
+        return self.registry.load(ENCODER_NAME, version, mmap_mode=None), version
+
+    def _stream(self, chunksize, holdout_fraction, output='dense'):
+        """Yield (features, X, y, holdout_mask) per chunk.
+
+        features are the raw feature columns and X the model input: the
+        features one-hot encoded by self.encoder (in the given output form)
+        when it is set.
+        The held-out rows of a chunk are drawn from an RNG keyed on the chunk
+        number, so every pass over the same data holds out the same rows.
+        Rows whose target is not 0/1 (e.g. an imputed mean) are skipped.
+        """
+        for i, chunk in enumerate(self._iter_chunks(chunksize)):
+            if self.target_col not in chunk.columns:
+                error_msg = f"Target column '{self.target_col}' not found."
+                log_error(error_msg)
+                raise ValueError(error_msg)
+            chunk = chunk[chunk[self.target_col].isin((0, 1))]
+            features = chunk.drop(columns=[self.target_col])
+            if self.encoder is not None:
+                X = self.encoder.transform(features, output=output)
+            else:
+                X = features.astype(float)
+            y = chunk[self.target_col].to_numpy().astype(int)
+            rng = np.random.default_rng(np.random.SeedSequence(self.random_state, spawn_key=(i,)))
+            yield features, X, y, rng.random(len(chunk)) < holdout_fraction
+
+    @instrument(rows=lambda best, args, kwargs: best["n_train"])
+    def run_incremental(self, chunksize=100000, holdout_fraction=0.2, n_epochs=1, warm_start=True):
+        """Fit a scaler + SGD logistic regression chunk by chunk with partial_fit.
+
+        Only one chunk is in memory at a time. A fixed share of every chunk
+        is held out; after training a second pass scores those rows. With
+        warm_start the latest registered version is updated with the new
+        data instead of being refit from scratch.
+
+        Categorical columns go through a CategoricalEncoder, fitted in an
+        extra pass over the data (or reused from the warm-start version, so
+        the layout does not change) and registered with the model.
+        """
+        if not 0 < holdout_fraction < 1:
+            error_msg = f"holdout_fraction must be between 0 and 1, got {holdout_fraction}"
+            log_error(error_msg)
+            raise ValueError(error_msg)
+        if warm_start and self.registry.versions(INCREMENTAL_MODEL):
+            # Loaded without mmap: partial_fit updates the arrays in place
+            model = self.registry.load(INCREMENTAL_MODEL, mmap_mode=None)
+            self.encoder, self.encoder_version = self._registered_encoder(INCREMENTAL_MODEL)
+            print(f"Warm start from: {self.registry.path(INCREMENTAL_MODEL)}")
+        else:
+            model = make_incremental_model(self.random_state)
+            self.encoder, self.encoder_version = self._fit_stream_encoder(chunksize), None
+        scaler, clf = model.named_steps["scaler"], model.named_steps["clf"]
+        output = output_for(model)
+
+        print(f"Streaming data from: {self._source()}")
+        n_train = 0
+        for epoch in range(n_epochs):
+            for _, X, y, holdout in self._stream(chunksize, holdout_fraction, output):
+                X_train, y_train = X[~holdout], y[~holdout]
+                if len(y_train) == 0:
+                    continue
+                # Online standardization: running mean/variance over all chunks so far
+                if epoch == 0:
+                    scaler.partial_fit(X_train)
+                    n_train += len(y_train)
+                clf.partial_fit(scaler.transform(X_train), y_train, classes=[0, 1])
+
+        y_test, y_prob = [], []
+        for features, X, y, holdout in self._stream(chunksize, holdout_fraction, output):
+            if holdout.any():
+                y_test.append(y[holdout])
+                y_prob.append(model.predict_proba(X[holdout])[:, 1])
+        if not y_test:
+            error_msg = ("No held-out rows to score: the data is too small for "
+                         f"holdout_fraction={holdout_fraction}")
+            log_error(error_msg)
+            raise ValueError(error_msg)
+        y_test, y_prob = np.concatenate(y_test), np.concatenate(y_prob)
+        self.data_info = {
+            "data_hash": hash_data(self.data if self.data is not None
+                                   else FileRef(self.data_path)).hexdigest(),
+            "features": {col: str(dtype) for col, dtype in features.dtypes.items()},
+            "n_rows": n_train + len(y_test),
+        }
+
+        m = {"model": INCREMENTAL_MODEL}
+        m.update(compute_metrics(y_test, (y_prob >= 0.5).astype(int), y_prob))
+        m.update({"n_train": n_train, "n_test": len(y_test)})
+        print(f"{INCREMENTAL_MODEL}: acc={m['accuracy']:.4f} prec={m['precision']:.4f} "
+              f"rec={m['recall']:.4f} f1={m['f1']:.4f} auc={m['roc_auc']:.4f} "
+              f"({n_train} train / {len(y_test)} held-out rows)")
+
+        self.models = {INCREMENTAL_MODEL: model}
+        self.metrics = [m]
+        self.save_models()
+        self.save_metrics()
+        return m
+
 if __name__ == "__main__":
-    trainer = ModelTrainer()
-    trainer.run()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train and evaluate the models.")
+    parser.add_argument("--data-path", default=None)
+    parser.add_argument("--incremental", action="store_true",
+                        help="Stream the data through an SGD model with partial_fit")
+    parser.add_argument("--chunksize", type=int, default=100000)
+    parser.add_argument("--no-warm-start", action="store_true")
+    parser.add_argument("--search", action="store_true",
+                        help="Tune both models with successive-halving random search")
+    parser.add_argument("--n-candidates", type=int, default=16)
+    args = parser.parse_args()
+
+    trainer = ModelTrainer(data_path=args.data_path)
+    if args.search:
+        trainer.run_search(n_candidates=args.n_candidates)
+    elif args.incremental:
+        trainer.run_incremental(chunksize=args.chunksize, warm_start=not args.no_warm_start)
+    else:
+        trainer.run()
@@ -0,0 +1,276 @@
+"""
+Pure-NumPy scorers exported from trained models.
+
+sklearn spends most of a small predict_proba call on input validation and
+per-estimator Python overhead. export_model turns a fitted model into a
+scorer that only does the math:
+
+- Pipeline([StandardScaler, LogisticRegression or SGDClassifier(log_loss)]):
+  the scaler is folded into the coefficients, so scoring is one matrix
+  product and a sigmoid.
+- RandomForestClassifier: every tree is flattened into shared contiguous
+  node arrays, and all (row, tree) pairs still above a leaf walk down one
+  level per vectorized step.
+
+The scorers are built for online latency: one row or a few hundred. A
+forest walk gathers one node per (row, tree) pair per step, so for large
+batches sklearn's compiled trees are faster. A ForestScorer therefore keeps
+the fitted forest and hands batches above SKLEARN_BATCH_SIZE rows to it.
+
+Exported scorers hold plain arrays, so registering them in the model
+registry uncompressed lets worker processes memory-map and share them. The
+kept forest is the exception: it is copied into every process on load, so
+export with keep_forest=False where shared memory matters more than large
+batch throughput.
+"""
+import numpy as np
+
+try:
+    from .error_log import log_error
+except ImportError:
+    from error_log import log_error
+
+# Rows per batch when walking the forest; bounds the (rows, trees) work arrays
+FOREST_BATCH_SIZE = 8192
+# Larger batches go to the kept sklearn forest, which is faster from about here
+SKLEARN_BATCH_SIZE = 256
+
+
+class _NumpyScorer:
+    """Shared input handling: DataFrames are reordered to the training columns."""
+
+    feature_names_in_ = None
+
+    def _matrix(self, X, dtype):
+        if hasattr(X, 'columns'):
+            names = self.feature_names_in_
+            if names is not None and list(X.columns) != list(names):
+                X = X[list(names)]
+            X = X.to_numpy(dtype=dtype)
+        X = np.asarray(X, dtype=dtype)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class LinearScorer(_NumpyScorer):
+    """Binary logistic model with the standardization folded into its weights."""
+
+    def __init__(self, coef, intercept, classes, feature_names=None):
+        self.coef_ = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept_ = float(intercept)
+        self.classes_ = np.asarray(classes)
+        self.feature_names_in_ = feature_names
+
+    def predict_proba(self, X):
+        z = self._matrix(X, np.float64) @ self.coef_ + self.intercept_
+        p = 1.0 / (1.0 + np.exp(-z))
+        return np.column_stack([1.0 - p, p])
+
+
+class ForestScorer(_NumpyScorer):
+    """All trees of a random forest in flat node arrays.
+
+    Node i of the forest splits on feature[i] at threshold[i] and has
+    children left[i] and right[i]; leaf[i] marks nodes whose class
+    distribution proba[i] is the tree's answer. NaN inputs go to the left
+    child where missing_left[i] is set, like sklearn's missing_go_to_left;
+    without that array (sklearn < 1.3) NaN inputs are rejected. forest is
+    the optional sklearn model that scores batches above SKLEARN_BATCH_SIZE.
+    """
+
+    missing_left = None
+    forest = None
+
+    def __init__(self, feature, threshold, left, right, leaf, proba, roots, classes,
+                 feature_names=None, missing_left=None, forest=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf = leaf
+        self.proba = proba
+        self.roots = roots
+        self.classes_ = np.asarray(classes)
+        self.feature_names_in_ = feature_names
+        self.missing_left = missing_left
+        self.forest = forest
+
+    @classmethod
+    def from_forest(cls, forest, keep_forest=True):
+        features, thresholds, lefts, rights, leaves, probas, roots = [], [], [], [], [], [], []
+        missing_left = []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            leaf = tree.children_left < 0
+            features.append(np.where(leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(leaf, 0, tree.children_left) + offset)
+            rights.append(np.where(leaf, 0, tree.children_right) + offset)
+            leaves.append(leaf)
+            value = tree.value[:, 0, :]
+            probas.append(value / value.sum(axis=1, keepdims=True))
+            roots.append(offset)
+            if missing_left is not None and hasattr(tree, 'missing_go_to_left'):
+                missing_left.append(np.asarray(tree.missing_go_to_left, dtype=bool) & ~leaf)
+            else:
+                missing_left = None
+            offset += tree.node_count
+
+        index_dtype = np.int32 if offset < 2 ** 31 else np.int64
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(index_dtype),
+            right=np.concatenate(rights).astype(index_dtype),
+            leaf=np.concatenate(leaves),
+            proba=np.concatenate(probas),
+            roots=np.asarray(roots, dtype=index_dtype),
+            classes=forest.classes_,
+            feature_names=getattr(forest, 'feature_names_in_', None),
+            missing_left=np.concatenate(missing_left) if missing_left else None,
+            forest=forest if keep_forest else None,
+        )
+
+    def _batch_proba(self, X, has_nan=False):
+        n_rows, n_features = X.shape
+        n_trees = len(self.roots)
+        flat_X = X.ravel()
+        # One entry per (row, tree) pair; only pairs not yet at a leaf move down
+        node = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows) * n_features, n_trees)
+        active = np.flatnonzero(~self.leaf[node])
+        while len(active):
+            current = node[active]
+            # float32 inputs against float64 thresholds, exactly like sklearn's trees
+            values = flat_X[row_offset[active] + self.feature[current]]
+            go_left = values <= self.threshold[current]
+            if has_nan:
+                # NaN <= threshold is False: NaNs go right unless the node sends them left
+                go_left |= np.isnan(values) & self.missing_left[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            node[active] = current
+            active = active[~self.leaf[current]]
+        return self.proba[node].reshape(n_rows, n_trees, -1).mean(axis=1)
+
+    def predict_proba(self, X):
+        if self.forest is not None and getattr(X, 'ndim', 1) == 2 and len(X) > SKLEARN_BATCH_SIZE:
+            # A forest fitted on a matrix (e.g. sparse one-hot output) has no feature names
+            if self.feature_names_in_ is None and hasattr(X, 'columns'):
+                X = X.to_numpy(dtype=np.float32)
+            return self.forest.predict_proba(X)
+        X = np.ascontiguousarray(self._matrix(X, np.float32))
+        has_nan = bool(np.isnan(X).any())
+        if has_nan and self.missing_left is None:
+            error_msg = "Input contains NaN, but the exported forest has no missing-value routing"
+            log_error(error_msg)
+            raise ValueError(error_msg)
+        if len(X) <= FOREST_BATCH_SIZE:
+            return self._batch_proba(X, has_nan)
+        return np.concatenate([self._batch_proba(X[start:start + FOREST_BATCH_SIZE], has_nan)
+                               for start in range(0, len(X), FOREST_BATCH_SIZE)])
+
+
+def _export_linear(model):
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    scaler, clf = None, model
+    if isinstance(model, Pipeline):
+        if len(model.steps) > 2:
+            return None
+        if len(model.steps) == 2:
+            scaler = model.steps[0][1]
+            if not isinstance(scaler, StandardScaler):
+                return None
+        clf = model.steps[-1][1]
+    if getattr(clf, 'loss', 'log_loss') != 'log_loss' or not hasattr(clf, 'coef_'):
+        return None
+    if clf.coef_.shape[0] != 1:
+        return None
+
+    coef, intercept = clf.coef_[0], clf.intercept_[0]
+    if scaler is not None:
+        # w.(x - mean)/scale + b  ==  (w/scale).x + (b - w.mean/scale)
+        mean = scaler.mean_ if getattr(scaler, 'with_mean', True) and scaler.mean_ is not None else 0.0
+        scale = scaler.scale_ if getattr(scaler, 'with_std', True) and scaler.scale_ is not None else 1.0
+        coef = coef / scale
+        intercept = intercept - np.sum(coef * mean)
+    return LinearScorer(coef, intercept, clf.classes_,
+                        feature_names=getattr(model, 'feature_names_in_', None))
+
+
+def export_model(model, keep_forest=True):
+    """Return a NumPy scorer equivalent to model's predict_proba.
+
+    Supports a fitted RandomForestClassifier and binary logistic models
+    (LogisticRegression or SGDClassifier(loss='log_loss')), optionally
+    behind a StandardScaler in a Pipeline. keep_forest=False drops the
+    sklearn forest used for large batches, leaving only shareable arrays.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    model = getattr(model, 'model', model)  # unwrap a registry LazyModel
+    if isinstance(model, RandomForestClassifier):
+        return ForestScorer.from_forest(model, keep_forest=keep_forest)
+    scorer = _export_linear(model)
+    if scorer is None:
+        error_msg = f"Cannot export {type(model).__name__} to a NumPy scorer"
+        log_error(error_msg)
+        raise ValueError(error_msg)
+    return scorer
+
+
+def max_proba_difference(model, scorer, X):
+    """Largest absolute difference between the two predict_proba outputs."""
+    return float(np.max(np.abs(model.predict_proba(X) - scorer.predict_proba(X))))
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import time
+
+    try:
+        from .model_registry import ModelRegistry
+        from .numpy_inference import export_model
+        from .paths import PROCESSED_DATA_DIR
+        from .storage import load_frame
+    except ImportError:
+        # Re-import so the registered scorer pickles as numpy_inference.*, not __main__.*
+        from model_registry import ModelRegistry
+        from numpy_inference import export_model
+        from paths import PROCESSED_DATA_DIR
+        from storage import load_frame
+
+    parser = argparse.ArgumentParser(description="Export a registered model to a NumPy scorer.")
+    parser.add_argument("name", nargs="?", default="random_forest")
+    parser.add_argument("--data-path", default=os.path.join(PROCESSED_DATA_DIR, 'augmented_data.csv'))
+    parser.add_argument("--target-col", default="purchased")
+    parser.add_argument("--no-forest", action="store_true",
+                        help="Drop the sklearn forest used for large batches (arrays only)")
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    model = registry.load(args.name)
+    scorer = export_model(model, keep_forest=not args.no_forest)
+    X = load_frame(args.data_path).drop(columns=[args.target_col])
+    print(f"Max probability difference: {max_proba_difference(model, scorer, X):.2e}")
+
+    for label, rows in (("single row", X.iloc[:1]), (f"batch of {len(X)}", X)):
+        timings = {}
+        for name, estimator in (("sklearn", model), ("numpy", scorer)):
+            start = time.perf_counter()
+            for _ in range(20):
+                estimator.predict_proba(rows)
+            timings[name] = (time.perf_counter() - start) / 20
+        print(f"{label}: sklearn {timings['sklearn'] * 1e3:.2f} ms, "
+              f"numpy {timings['numpy'] * 1e3:.2f} ms")
+
+    meta = registry.metadata(args.name)
+    version = registry.register(f"{args.name}_numpy", scorer, metrics=meta.get('metrics'),
+                                data_hash=meta.get('data_hash'), features=meta.get('features'),
+                                extra={'exported_from': f"{args.name} v{meta['version']}"})
+    print(f"Registered {args.name}_numpy version {version}")
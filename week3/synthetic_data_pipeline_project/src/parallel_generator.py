@@ -0,0 +1,83 @@
+"""
+Parallel synthetic data generation across a process pool.
+
+The dataset is split into the same fixed-size blocks used by
+DataGenerator.generate_dataset_stream. Each block has its own RNG stream,
+so the combined output does not depend on the number of workers.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+try:
+    from .data_generator import (DataGenerator, DataGenerationError,
+                                 STREAM_BLOCK_SIZE, _generate_block)
+    from .instrumentation import instrument
+except ImportError:
+    from data_generator import (DataGenerator, DataGenerationError,
+                                STREAM_BLOCK_SIZE, _generate_block)
+    from instrumentation import instrument
+
+
+def _shard_bounds(n_samples):
+    """Return (shard_index, n_rows) for every block of the dataset."""
+    n_shards = -(-n_samples // STREAM_BLOCK_SIZE)
+    return [(i, min(STREAM_BLOCK_SIZE, n_samples - i * STREAM_BLOCK_SIZE))
+            for i in range(n_shards)]
+
+
+def _generate_shard(args):
+    """Worker: build one shard, optionally writing it straight to disk."""
+    random_seed, shard_index, n_rows, output_dir = args
+    df = _generate_block(random_seed, shard_index, n_rows)
+    df.index = pd.RangeIndex(shard_index * STREAM_BLOCK_SIZE,
+                             shard_index * STREAM_BLOCK_SIZE + n_rows)
+    if output_dir is None:
+        return df
+    path = os.path.join(output_dir, f"part-{shard_index:05d}.csv")
+    df.to_csv(path, index=False)
+    return path
+
+
+@instrument(rows=lambda result, args, kwargs: args[0] if args else kwargs.get('n_samples'))
+def generate_parallel(n_samples, random_seed=42, n_workers=None, output_dir=None):
+    """Generate n_samples rows on a process pool.
+
+    Returns the concatenated DataFrame, or the list of shard file paths
+    when output_dir is given. Results are identical for any n_workers and
+    match DataGenerator(random_seed).generate_dataset_stream.
+    """
+    generator = DataGenerator(random_seed)
+    generator._validate_count('n_samples', n_samples)
+    if n_workers is not None:
+        generator._validate_count('n_workers', n_workers)
+
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    tasks = [(random_seed, index, n_rows, output_dir)
+             for index, n_rows in _shard_bounds(n_samples)]
+    n_workers = min(n_workers or os.cpu_count() or 1, len(tasks))
+
+    try:
+        if n_workers == 1:
+            results = [_generate_shard(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                results = list(executor.map(_generate_shard, tasks))
+    except Exception as e:
+        error_msg = f"Parallel data generation failed: {str(e)}"
+        generator.log_error(error_msg)
+        raise DataGenerationError(error_msg)
+
+    if output_dir is not None:
+        print(f"Wrote {len(results)} shards to: {output_dir}")
+        return results
+    return pd.concat(results)
+
+
+if __name__ == "__main__":
+    df = generate_parallel(200000)
+    print(f"Generated {len(df)} rows")
+    print(df.head())
@@ -0,0 +1,14 @@
+"""
+Project directory layout, resolved from this file instead of the cwd.
+"""
+import os
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+RAW_DATA_DIR = os.path.join(DATA_DIR, 'raw')
+PROCESSED_DATA_DIR = os.path.join(DATA_DIR, 'processed')
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'models')
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'results')
+PLOTS_DIR = os.path.join(PROJECT_ROOT, 'plots')
+LOGS_DIR = os.path.join(PROJECT_ROOT, 'logs')
@@ -0,0 +1,291 @@
+"""
+DAG runner for the generate -> clean -> augment -> train pipeline.
+
+Stages declare typed inputs and one typed output. Independent stages run
+concurrently on a thread pool (e.g. plotting while the models train), and
+stages whose inputs, parameters and code are unchanged are served from the
+StageCache instead of being recomputed.
+
+Usage (paths resolve from the project root, so any cwd works):
+    python src/pipeline.py --n-samples 500 --method noise
+    python -m src.pipeline --targets plots --force
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+try:
+    from .augment import augment_dataset
+    from .cache import StageCache
+    from .data_generator import DataGenerator
+    from .data_preparation import encode_categorical_variables, handle_missing_values
+    from .encoding import CategoricalEncoder
+    from .error_log import log_error
+    from .model_registry import ModelRegistry
+    from .model_trainer import ModelTrainer, register_encoder, register_model, write_metrics
+    from .paths import MODELS_DIR, PLOTS_DIR, PROCESSED_DATA_DIR, RAW_DATA_DIR, RESULTS_DIR
+    from .status import get_all_stats
+    from .storage import save_frame
+    from .visuals import overview_figures
+except ImportError:
+    from augment import augment_dataset
+    from cache import StageCache
+    from data_generator import DataGenerator
+    from data_preparation import encode_categorical_variables, handle_missing_values
+    from encoding import CategoricalEncoder
+    from error_log import log_error
+    from model_registry import ModelRegistry
+    from model_trainer import ModelTrainer, register_encoder, register_model, write_metrics
+    from paths import MODELS_DIR, PLOTS_DIR, PROCESSED_DATA_DIR, RAW_DATA_DIR, RESULTS_DIR
+    from status import get_all_stats
+    from storage import save_frame
+    from visuals import overview_figures
+
+NUMERICAL_COLS = ['age', 'income', 'purchase_amount', 'monthly_visits', 'satisfaction_score']
+TARGET_COL = 'purchased'
+
+
+class PipelineError(Exception):
+    """Custom exception for an invalid pipeline graph or stage output."""
+    pass
+
+
+def _fail(error_msg):
+    log_error(error_msg)
+    raise PipelineError(error_msg)
+
+
+class Stage:
+    """One pipeline step: output = func(*inputs, **params)."""
+
+    def __init__(self, name, func, inputs=None, output=None, params=None,
+                 save=None, saved=None, code=(), cache=True):
+        self.name = name
+        self.func = func
+        # {artifact name: expected type}, passed to func positionally in order
+        self.inputs = dict(inputs or {})
+        # (artifact name, expected type)
+        self.output = output
+        self.params = dict(params or {})
+        # Optional callback writing the output to disk. It runs when the stage
+        # executes; on a cache hit only if saved(value) reports the artifact
+        # missing (use --force to rewrite artifacts that exist)
+        self.save = save
+        self.saved = saved
+        # Extra callables whose source is part of the cache key
+        self.code = tuple(code)
+        self.cache = cache
+
+
+class Pipeline:
+    """Runs a set of stages as a DAG over their named artifacts."""
+
+    def __init__(self, stages, cache=None, max_workers=4):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache = cache
+        self.max_workers = max_workers
+        self.producers = {}
+        for stage in stages:
+            artifact = stage.output[0]
+            if artifact in self.producers:
+                _fail(f"Artifact '{artifact}' is produced by more than one stage")
+            self.producers[artifact] = stage.name
+        for stage in stages:
+            for artifact in stage.inputs:
+                if artifact not in self.producers:
+                    _fail(f"Stage '{stage.name}' needs unknown artifact '{artifact}'")
+
+    def _required(self, targets):
+        """Names of the target stages and everything upstream of them."""
+        if not targets:
+            return set(self.stages)
+        required, todo = set(), list(targets)
+        while todo:
+            name = todo.pop()
+            if name not in self.stages:
+                _fail(f"Unknown stage '{name}'")
+            if name not in required:
+                required.add(name)
+                todo += [self.producers[a] for a in self.stages[name].inputs]
+        return required
+
+    def _execute(self, stage, inputs, force):
+        for (artifact, expected), value in zip(stage.inputs.items(), inputs):
+            if not isinstance(value, expected):
+                _fail(f"Stage '{stage.name}' input '{artifact}' should be "
+                      f"{expected.__name__}, got {type(value).__name__}")
+        start = time.perf_counter()
+        hit = False
+        try:
+            if self.cache is not None and stage.cache and not force:
+                key = self.cache.key(stage.name, inputs, stage.params, stage.func, stage.code)
+                hit, value = self.cache.get(key)
+                if hit:
+                    print(f"Cache hit: {stage.name}")
+                else:
+                    value = stage.func(*inputs, **stage.params)
+                    self.cache.put(key, value, stage=stage.name)
+            else:
+                value = stage.func(*inputs, **stage.params)
+        except Exception as e:
+            log_error(f"Stage '{stage.name}' failed: {e}")
+            raise
+
+        artifact, expected = stage.output
+        if not isinstance(value, expected):
+            _fail(f"Stage '{stage.name}' output '{artifact}' should be "
+                  f"{expected.__name__}, got {type(value).__name__}")
+        if stage.save is not None and (not hit or stage.saved is None
+                                       or not stage.saved(value)):
+            stage.save(value)
+        print(f"Stage '{stage.name}' finished in {time.perf_counter() - start:.2f}s")
+        return value
+
+    def run(self, targets=None, force=False):
+        """Run the target stages (default: all) and return the artifacts."""
+        pending = self._required(targets)
+        artifacts, running = {}, {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in sorted(pending):
+                    stage = self.stages[name]
+                    if all(a in artifacts for a in stage.inputs):
+                        inputs = [artifacts[a] for a in stage.inputs]
+                        running[executor.submit(self._execute, stage, inputs, force)] = stage
+                        pending.discard(name)
+                if not running:
+                    _fail(f"Pipeline has a cycle among: {sorted(pending)}")
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    artifacts[stage.output[0]] = future.result()
+        return artifacts
+
+
+# Stage functions
+
+def generate(n_samples, random_seed):
+    return DataGenerator(random_seed).generate_dataset(n_samples)
+
+def clean(raw):
+    return encode_categorical_variables(handle_missing_values(raw.copy()))
+
+def augment(cleaned, method):
+    return augment_dataset(cleaned, TARGET_COL, NUMERICAL_COLS, method=method)
+
+def train(augmented, random_state):
+    trainer = ModelTrainer(data=augmented, random_state=random_state)
+    models, metrics = trainer.train()
+    return {'models': models, 'metrics': metrics, 'data_info': trainer.data_info,
+            'encoder': trainer.encoder}
+
+def describe(cleaned):
+    return {col: {k: float(v) for k, v in get_all_stats(cleaned[col]).items()}
+            for col in NUMERICAL_COLS}
+
+def plots(raw, cleaned):
+    return overview_figures(raw, numeric_df=cleaned)
+
+
+# Writers for the project layout
+
+STATS_PATH = os.path.join(RESULTS_DIR, 'stats.json')
+METRICS_PATH = os.path.join(RESULTS_DIR, 'metrics.csv')
+
+def _save_frame_to(path):
+    return lambda df: save_frame(df, path)
+
+def _file_exists(path):
+    return lambda value: os.path.isfile(path)
+
+def _save_training(result):
+    registry = ModelRegistry(MODELS_DIR)
+    encoder_version = None
+    if result.get('encoder') is not None:
+        encoder_version = register_encoder(registry, result['encoder'], result.get('data_info'))
+    for name, model in result['models'].items():
+        register_model(registry, name, model, result['metrics'], result.get('data_info'),
+                       source='pipeline', encoder_version=encoder_version)
+    write_metrics(result['metrics'], RESULTS_DIR)
+
+def _training_saved(result):
+    # Registered when the latest version of every model was trained on this data
+    registry = ModelRegistry(MODELS_DIR)
+    data_hash = result.get('data_info', {}).get('data_hash')
+    for name in result['models']:
+        if not registry.versions(name) or registry.metadata(name).get('data_hash') != data_hash:
+            return False
+    return os.path.isfile(METRICS_PATH)
+
+def _save_stats(stats):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(STATS_PATH, 'w') as f:
+        json.dump(stats, f, indent=2)
+
+def _save_plots(pngs):
+    os.makedirs(PLOTS_DIR, exist_ok=True)
+    for name, png in pngs.items():
+        with open(os.path.join(PLOTS_DIR, name), 'wb') as f:
+            f.write(png)
+
+def _plots_saved(pngs):
+    return all(os.path.isfile(os.path.join(PLOTS_DIR, name)) for name in pngs)
+
+
+def build_pipeline(n_samples=500, random_seed=42, method='noise', data_format='csv',
+                   cache=None, max_workers=4):
+    """The standard project pipeline."""
+    ext = f".{data_format}"
+    raw_path = os.path.join(RAW_DATA_DIR, 'generated_data' + ext)
+    cleaned_path = os.path.join(PROCESSED_DATA_DIR, 'cleaned_data' + ext)
+    augmented_path = os.path.join(PROCESSED_DATA_DIR, 'augmented_data' + ext)
+    stages = [
+        Stage('generate', generate, output=('raw', pd.DataFrame),
+              params={'n_samples': n_samples, 'random_seed': random_seed},
+              save=_save_frame_to(raw_path), saved=_file_exists(raw_path),
+              code=(DataGenerator,)),
+        Stage('clean', clean, inputs={'raw': pd.DataFrame}, output=('cleaned', pd.DataFrame),
+              save=_save_frame_to(cleaned_path), saved=_file_exists(cleaned_path),
+              code=(handle_missing_values, encode_categorical_variables)),
+        Stage('augment', augment, inputs={'cleaned': pd.DataFrame},
+              output=('augmented', pd.DataFrame), params={'method': method},
+              save=_save_frame_to(augmented_path), saved=_file_exists(augmented_path),
+              code=(augment_dataset,)),
+        Stage('train', train, inputs={'augmented': pd.DataFrame}, output=('training', dict),
+              params={'random_state': random_seed}, save=_save_training, saved=_training_saved,
+              code=(ModelTrainer, CategoricalEncoder)),
+        Stage('stats', describe, inputs={'cleaned': pd.DataFrame}, output=('stats', dict),
+              save=_save_stats, saved=_file_exists(STATS_PATH), code=(get_all_stats,)),
+        Stage('plots', plots, inputs={'raw': pd.DataFrame, 'cleaned': pd.DataFrame},
+              output=('figures', dict), save=_save_plots, saved=_plots_saved,
+              code=(overview_figures,)),
+    ]
+    return Pipeline(stages, cache=cache, max_workers=max_workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the synthetic data pipeline.")
+    parser.add_argument('--n-samples', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--method', default='noise',
+                        choices=['noise', 'oversample', 'synthetic', 'smote', 'all'])
+    parser.add_argument('--format', default='csv', choices=['csv', 'parquet', 'feather', 'npy'])
+    parser.add_argument('--targets', nargs='+', default=None,
+                        help="Only run these stages (and what they depend on)")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--force', action='store_true', help="Recompute every stage")
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else StageCache()
+    pipeline = build_pipeline(args.n_samples, args.seed, args.method, args.format,
+                              cache=cache, max_workers=args.workers)
+    pipeline.run(targets=args.targets, force=args.force)
+
+
+if __name__ == "__main__":
+    main()
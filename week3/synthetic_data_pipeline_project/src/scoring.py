@@ -0,0 +1,117 @@
+"""
+Batch scoring of trained models over arbitrarily large input files.
+"""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .encoding import ENCODER_NAME, output_for
+    from .instrumentation import instrument
+    from .model_registry import ModelRegistry
+    from .paths import MODELS_DIR
+    from .storage import iter_frames, write_frames
+except ImportError:
+    from encoding import ENCODER_NAME, output_for
+    from instrumentation import instrument
+    from model_registry import ModelRegistry
+    from paths import MODELS_DIR
+    from storage import iter_frames, write_frames
+
+
+def load_model(name_or_path, version=None, registry=None):
+    """Return a model by path, or by name from the model registry.
+
+    Registered models come back as a LazyModel (loaded on first use,
+    memory-mapped when uncompressed). Names that are only present as a
+    plain models/<name>.joblib file are loaded directly.
+    """
+    import joblib
+
+    if os.path.isfile(name_or_path):
+        return joblib.load(name_or_path)
+    registry = registry or ModelRegistry(MODELS_DIR)
+    if version is not None or registry.versions(name_or_path):
+        return registry.get(name_or_path, version)
+    return joblib.load(os.path.join(MODELS_DIR, f"{name_or_path}.joblib"))
+
+
+def load_encoder(model):
+    """The CategoricalEncoder registered with a registry model, or None."""
+    metadata = getattr(model, 'metadata', None)
+    if not isinstance(metadata, dict) or metadata.get('encoder_version') is None:
+        return None
+    return model.registry.load(ENCODER_NAME, metadata['encoder_version'], mmap_mode=None)
+
+
+class BatchScorer:
+    """Loads a model once and scores DataFrames or files chunk by chunk.
+
+    Models trained on categorical columns get their registered
+    CategoricalEncoder (or the encoder passed in) applied to every chunk.
+    """
+
+    def __init__(self, model, feature_cols=None, encoder=None):
+        self.model = load_model(model) if isinstance(model, str) else model
+        self.encoder = encoder if encoder is not None else load_encoder(self.model)
+        if feature_cols is None and self.encoder is not None:
+            feature_cols = self.encoder.get_input_names()
+        if feature_cols is None:
+            feature_cols = getattr(self.model, 'feature_names_in_', None)
+        self.feature_cols = list(feature_cols) if feature_cols is not None else None
+
+    def score_frame(self, df):
+        """Return predicted class and positive-class probability for df."""
+        X = df[self.feature_cols] if self.feature_cols is not None else df
+        if self.encoder is not None:
+            X = self.encoder.transform(X, output=output_for(self.model))
+        proba = self.model.predict_proba(X)
+        classes = self.model.classes_
+        return pd.DataFrame({
+            'prediction': classes[np.argmax(proba, axis=1)],
+            'probability': proba[:, -1]
+        }, index=df.index)
+
+    def _scored_chunks(self, input_path, chunksize, n_threads, keep_columns):
+        # At most 2 * n_threads chunks are in flight; output keeps input order
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            pending = deque()
+            for chunk in iter_frames(input_path, chunksize=chunksize):
+                pending.append((chunk, executor.submit(self.score_frame, chunk)))
+                if len(pending) >= 2 * n_threads:
+                    yield self._finish(*pending.popleft(), keep_columns)
+            while pending:
+                yield self._finish(*pending.popleft(), keep_columns)
+
+    def _finish(self, chunk, future, keep_columns):
+        scores = future.result()
+        if keep_columns:
+            scores = pd.concat([chunk[list(keep_columns)], scores], axis=1)
+        return scores
+
+    @instrument(rows=lambda n_rows, args, kwargs: n_rows)
+    def score_file(self, input_path, output_path, chunksize=100000, n_threads=4,
+                   keep_columns=None):
+        """Score input_path in chunks on a thread pool and stream results to output_path."""
+        chunks = self._scored_chunks(input_path, chunksize, n_threads, keep_columns)
+        n_rows = write_frames(chunks, output_path)
+        print(f"Scored {n_rows} rows into: {output_path}")
+        return n_rows
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score a data file with a trained model.")
+    parser.add_argument("input_path")
+    parser.add_argument("output_path")
+    parser.add_argument("--model", default="random_forest")
+    parser.add_argument("--chunksize", type=int, default=100000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    BatchScorer(args.model).score_file(args.input_path, args.output_path,
+                                       chunksize=args.chunksize, n_threads=args.threads)
@@ -0,0 +1,235 @@
+"""
+Local asyncio HTTP endpoint that micro-batches single-row predictions.
+
+Concurrent POST /predict requests are queued and scored together with one
+predict_proba call once max_batch_size rows are waiting or max_wait_ms has
+passed since the first row of the batch arrived.
+
+Request body:  {"age": 35, "income": 52000, ...}  (feature name -> value)
+Response body: {"prediction": 1, "probability": 0.73}
+A request with a missing or non-numeric feature gets a 400 on its own;
+the rest of its batch is still scored.
+"""
+import asyncio
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .encoding import output_for
+    from .error_log import log_error
+    from .scoring import load_encoder, load_model
+except ImportError:
+    from encoding import output_for
+    from error_log import log_error
+    from scoring import load_encoder, load_model
+
+
+class InvalidRequestError(Exception):
+    """Raised for a request whose features cannot be scored."""
+    pass
+
+
+class MicroBatcher:
+    """Collects single-row requests into batches for predict_proba."""
+
+    def __init__(self, model, feature_cols=None, max_batch_size=64, max_wait_ms=5.0,
+                 n_workers=2, encoder=None):
+        self.model = model
+        # Requests carry the raw categorical values; the encoder one-hot encodes them
+        self.encoder = encoder if encoder is not None else load_encoder(model)
+        if feature_cols is None and self.encoder is not None:
+            feature_cols = self.encoder.get_input_names()
+        # Sparse one-hot output for models that take it, a dense frame otherwise
+        self._encoder_output = output_for(model) if self.encoder is not None else None
+        if feature_cols is None:
+            feature_cols = getattr(model, 'feature_names_in_', None)
+        if feature_cols is None:
+            raise ValueError("feature_cols is required when the model has no feature_names_in_")
+        self.feature_cols = list(feature_cols)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._executor = ThreadPoolExecutor(max_workers=n_workers)
+        self._slots = asyncio.Semaphore(n_workers)
+        self._queue = None
+        self._task = None
+        # Running _score tasks; the loop only keeps weak references to tasks
+        self._scoring = set()
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._collect())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        self._executor.shutdown(wait=False)
+
+    async def predict(self, features):
+        """Queue one row and wait for its (prediction, probability).
+
+        Raises InvalidRequestError before queueing when a feature is missing
+        or not a finite number, so one bad row never fails a whole batch.
+        """
+        row = self._validate(features)
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    def _validate(self, features):
+        # Returns the feature values in feature_cols order
+        if not isinstance(features, dict):
+            error_msg = "Request body must be a JSON object of feature values"
+            log_error(error_msg)
+            raise InvalidRequestError(error_msg)
+        missing = [col for col in self.feature_cols if col not in features]
+        if missing:
+            error_msg = f"Missing features: {missing}"
+            log_error(error_msg)
+            raise InvalidRequestError(error_msg)
+        # Unseen or missing categories are valid: the encoder has a slot for them
+        categorical = self.encoder.categories_ if self.encoder is not None else {}
+        row = []
+        for col in self.feature_cols:
+            value = features[col]
+            if col in categorical:
+                valid = value is None or isinstance(value, (str, int, float))
+            else:
+                valid = isinstance(value, (int, float)) and math.isfinite(value)
+            if not valid:
+                error_msg = f"Feature '{col}' has an invalid value: {value!r}"
+                log_error(error_msg)
+                raise InvalidRequestError(error_msg)
+            row.append(value)
+        return row
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Keep collecting while earlier batches are still being scored
+            await self._slots.acquire()
+            task = asyncio.create_task(self._score(batch))
+            self._scoring.add(task)
+            task.add_done_callback(self._scoring.discard)
+
+    async def _score(self, batch):
+        try:
+            X = pd.DataFrame([row for row, _ in batch], columns=self.feature_cols)
+            if self.encoder is not None:
+                X = self.encoder.transform(X, output=self._encoder_output)
+            loop = asyncio.get_running_loop()
+            proba = await loop.run_in_executor(self._executor, self.model.predict_proba, X)
+            predictions = self.model.classes_[np.argmax(proba, axis=1)]
+            for (_, future), pred, prob in zip(batch, predictions, proba[:, -1]):
+                if not future.done():
+                    future.set_result((pred.item(), float(prob)))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+
+async def _send(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode()
+    reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}[status]
+    head = (f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode() + body)
+    await writer.drain()
+
+
+def make_handler(batcher):
+    """Minimal HTTP/1.1 handler with keep-alive: POST /predict, GET /health."""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                if method == "GET" and path == "/health":
+                    await _send(writer, 200, {"status": "ok"}, keep_alive)
+                elif method == "POST" and path == "/predict":
+                    try:
+                        features = json.loads(body)
+                    except ValueError:
+                        await _send(writer, 400, {"error": "invalid JSON"}, keep_alive)
+                    else:
+                        try:
+                            pred, prob = await batcher.predict(features)
+                            await _send(writer, 200, {"prediction": pred, "probability": prob},
+                                        keep_alive)
+                        except InvalidRequestError as e:
+                            await _send(writer, 400, {"error": str(e)}, keep_alive)
+                        except Exception as e:
+                            log_error(f"Prediction failed: {e}")
+                            await _send(writer, 500, {"error": str(e)}, keep_alive)
+                else:
+                    await _send(writer, 404, {"error": "not found"}, keep_alive)
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(model, host="127.0.0.1", port=8000, **batcher_kwargs):
+    """Run the prediction server until cancelled."""
+    if isinstance(model, str):
+        model = load_model(model)
+    batcher = MicroBatcher(model, **batcher_kwargs)
+    await batcher.start()
+    server = await asyncio.start_server(make_handler(batcher), host, port)
+    print(f"Serving predictions on http://{host}:{port}/predict")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Micro-batching prediction server.")
+    parser.add_argument("--model", default="random_forest")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.model, args.host, args.port,
+                      max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms))
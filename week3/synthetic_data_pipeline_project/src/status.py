@@ -2,28 +2,47 @@
 Statistics module using NumPy for calculating basic statistical measures.
 """
 import numpy as np
-import pandas as pd
+
+try:
+    from .instrumentation import instrument
+    from .streaming_stats import StreamingStats
+except ImportError:
+    from instrumentation import instrument
+    from streaming_stats import StreamingStats
+
+def _values(data):
+    # Series -> ndarray; checked by module name so pandas is not imported here
+    if type(data).__module__.startswith('pandas'):
+        return data.values
+    return data
 
 def calculate_mean(data):
     """Calculate mean using NumPy."""
-    if isinstance(data, pd.Series):
-        data = data.values
-    return np.mean(data)
+    return np.mean(_values(data))
 
 def calculate_median(data):
     """Calculate median using NumPy."""
-    if isinstance(data, pd.Series):
-        data = data.values
-    return np.median(data)
+    return np.median(_values(data))
 
 def calculate_std(data):
     """Calculate standard deviation using NumPy."""
-    if isinstance(data, pd.Series):
-        data = data.values
-    return np.std(data)
+    return np.std(_values(data))
 
+@instrument()
 def get_all_stats(data):
-    """Get mean, median, and std in one function."""
+    """Get mean, median, and std in one function.
+    
+    data may also be an iterator of chunks (e.g. storage.iter_frames column
+    slices) or a StreamingStats; then the median is approximate.
+    """
+    if isinstance(data, StreamingStats):
+        return data.to_dict()
+    if not (hasattr(data, '__array__') or isinstance(data, (list, tuple))):
+        stats = StreamingStats()
+        for chunk in data:
+            stats.update(chunk)
+        return stats.to_dict()
+    
     stats_dict = {
         'mean': calculate_mean(data),
         'median': calculate_median(data), 
@@ -0,0 +1,210 @@
+"""
+Storage backends for pipeline datasets.
+
+Supported formats are chosen by file extension:
+- .csv      plain text, readable anywhere
+- .parquet  columnar binary (requires pyarrow)
+- .feather  columnar binary (requires pyarrow)
+- .npy      directory with one .npy file per column plus schema.json;
+            numeric columns are memory-mapped on read
+
+Columns declared in schema.CUSTOMER_SCHEMA are cast to their compact types
+on save and on load, so a CSV round trip does not widen them to float64.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .error_log import log_error
+    from .schema import apply_schema
+except ImportError:
+    from error_log import log_error
+    from schema import apply_schema
+
+FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.npy': 'npy',
+}
+
+NPY_SCHEMA_FILE = 'schema.json'
+
+
+def detect_format(path):
+    """Return the storage format for a path based on its extension."""
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext not in FORMATS:
+        supported = ', '.join(sorted(FORMATS))
+        error_msg = f"Unsupported file extension '{ext}'. Use one of: {supported}"
+        log_error(error_msg)
+        raise ValueError(error_msg)
+    return FORMATS[ext]
+
+
+def compact_dtypes(df, max_category_ratio=0.5):
+    """Downcast numeric columns and turn low-cardinality strings into categories."""
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            # Whole-number floats (e.g. from a CSV round trip) go back to ints
+            if series.notna().all() and np.array_equal(series, np.round(series)):
+                df[col] = pd.to_numeric(series.astype(np.int64), downcast='integer')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            if series.nunique(dropna=True) <= max(1, int(len(series) * max_category_ratio)):
+                df[col] = series.astype('category')
+    return df
+
+
+def save_frame(df, path, compact=True):
+    """Save a DataFrame in the format implied by the path's extension."""
+    fmt = detect_format(path)
+    if compact:
+        df = compact_dtypes(apply_schema(df))
+
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+    elif fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'feather':
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        _save_npy(df, path)
+    return path
+
+
+def load_frame(path, columns=None, mmap=True):
+    """Load a DataFrame, reading only the requested columns when given."""
+    fmt = detect_format(path)
+    columns = list(columns) if columns is not None else None
+
+    if fmt == 'csv':
+        df = pd.read_csv(path, usecols=columns)
+    elif fmt == 'parquet':
+        df = pd.read_parquet(path, columns=columns)
+    elif fmt == 'feather':
+        df = pd.read_feather(path, columns=columns)
+    else:
+        df = _load_npy(path, columns=columns, mmap=mmap)
+    return apply_schema(df)
+
+
+def _save_npy(df, path):
+    """Write each column to its own .npy file inside the directory at path."""
+    os.makedirs(path, exist_ok=True)
+    schema = {'columns': []}
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        entry = {'name': str(col), 'file': f"{i:04d}.npy"}
+        if not isinstance(series.dtype, pd.CategoricalDtype) and not (
+                pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series)):
+            series = series.astype('category')
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            entry['categories'] = series.cat.categories.tolist()
+            entry['ordered'] = bool(series.cat.ordered)
+            values = series.cat.codes.to_numpy()
+        else:
+            values = series.to_numpy()
+        np.save(os.path.join(path, entry['file']), values)
+        schema['columns'].append(entry)
+
+    with open(os.path.join(path, NPY_SCHEMA_FILE), 'w') as f:
+        json.dump(schema, f, indent=2)
+
+
+def _load_npy(path, columns=None, mmap=True):
+    """Read a directory written by _save_npy."""
+    with open(os.path.join(path, NPY_SCHEMA_FILE)) as f:
+        schema = json.load(f)
+
+    entries = {entry['name']: entry for entry in schema['columns']}
+    if columns is None:
+        columns = [entry['name'] for entry in schema['columns']]
+    missing = [col for col in columns if col not in entries]
+    if missing:
+        error_msg = f"Columns not found in {path}: {missing}"
+        log_error(error_msg)
+        raise KeyError(error_msg)
+
+    data = {}
+    for col in columns:
+        entry = entries[col]
+        values = np.load(os.path.join(path, entry['file']),
+                         mmap_mode='r' if mmap else None)
+        if 'categories' in entry:
+            dtype = pd.CategoricalDtype(entry['categories'], ordered=entry['ordered'])
+            data[col] = pd.Categorical.from_codes(values, dtype=dtype)
+        else:
+            data[col] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def iter_frames(path, chunksize=100000, columns=None):
+    """Yield a dataset as DataFrames of at most chunksize rows."""
+    fmt = detect_format(path)
+    columns = list(columns) if columns is not None else None
+
+    if fmt == 'csv':
+        for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+            yield apply_schema(chunk)
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+            yield apply_schema(batch.to_pandas())
+    else:
+        # Feather is read once; .npy columns are memory-mapped so only the
+        # rows of each chunk are materialized
+        df = load_frame(path, columns=columns)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize].copy()
+
+
+def write_frames(frames, path, dtypes=None):
+    """Stream an iterable of DataFrames to one .csv or .parquet file.
+
+    Only one chunk is held in memory at a time. dtypes ({column: dtype})
+    fixes the output schema and every chunk is cast to it; without it the
+    first chunk's schema is used. Returns the row count.
+    """
+    fmt = detect_format(path)
+    if fmt not in ('csv', 'parquet'):
+        error_msg = f"Streaming writes support .csv and .parquet, got {path}"
+        log_error(error_msg)
+        raise ValueError(error_msg)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    n_rows = 0
+    writer = None
+    try:
+        for i, df in enumerate(frames):
+            if dtypes is not None:
+                df = df[list(dtypes)].astype(dtypes)
+            if fmt == 'csv':
+                df.to_csv(path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                if writer is None:
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    writer = pq.ParquetWriter(path, table.schema)
+                else:
+                    # Later chunks are cast to the first chunk's schema (safe
+                    # casts only: pass dtypes when chunks may differ)
+                    table = pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+            n_rows += len(df)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
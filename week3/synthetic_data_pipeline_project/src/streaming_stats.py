@@ -0,0 +1,144 @@
+"""
+Single-pass statistics over chunked data.
+
+StreamingStats keeps a Welford/Chan running mean and variance plus a
+mergeable quantile sketch, so data never has to fit in memory at once and
+partial results from different processes can be combined with merge().
+"""
+import numpy as np
+
+
+class QuantileSketch:
+    """Mergeable approximate quantile sketch (KLL-style compactor levels).
+
+    Level h holds items that each stand for 2**h inputs. When a level grows
+    past k items it is sorted and every other item (random offset) moves up
+    a level. Rank error is roughly O(log(n / k) / k) of n.
+    """
+
+    def __init__(self, k=512, seed=None):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        """Add a chunk of values (NaNs are ignored)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.k:
+                level = np.sort(level)
+                # An odd item out stays behind at this level
+                keep = level[-1:] if len(level) % 2 else level[:0]
+                pairs = level[:len(level) - len(keep)]
+                promoted = pairs[self._rng.integers(0, 2)::2]
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantile(self, q):
+        """Approximate q-th quantile (0 <= q <= 1)."""
+        if self.count == 0:
+            return np.nan
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h)
+                                  for h, level in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        values, weights = values[order], weights[order]
+        cumulative = np.cumsum(weights)
+        position = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+        return values[min(position, len(values) - 1)]
+
+
+class StreamingStats:
+    """Running count, mean, variance, min/max and approximate quantiles."""
+
+    def __init__(self, sketch_size=512, seed=None):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = QuantileSketch(k=sketch_size, seed=seed)
+
+    def update(self, chunk):
+        """Consume one chunk (Series, array or list)."""
+        values = np.asarray(getattr(chunk, 'values', chunk), dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if n == 0:
+            return self
+
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        self._combine(n, chunk_mean, chunk_m2)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        """Fold in the partial state of another StreamingStats."""
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self.sketch.merge(other.sketch)
+        return self
+
+    def _combine(self, n, mean, m2):
+        # Chan et al. parallel update of the Welford accumulators
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    def variance(self, ddof=0):
+        if self.count - ddof <= 0:
+            return np.nan
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        return np.sqrt(self.variance(ddof))
+
+    def quantile(self, q):
+        if q <= 0:
+            return self.min if self.count else np.nan
+        if q >= 1:
+            return self.max if self.count else np.nan
+        return self.sketch.quantile(q)
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def to_dict(self):
+        """Same keys as status.get_all_stats."""
+        return {
+            'mean': self.mean if self.count else np.nan,
+            'median': self.median(),
+            'std': self.std()
+        }
@@ -0,0 +1,34 @@
+"""
+Augmented frames keep one compact dtype per column.
+"""
+import contextlib
+import io
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.augment import augment_dataset
+from src.data_generator import DataGenerator
+
+NUMERICAL_COLS = ['age', 'income', 'purchase_amount', 'monthly_visits', 'satisfaction_score']
+
+def test_generated_rows_do_not_widen_columns():
+    df = DataGenerator(random_seed=1).generate_dataset(300)
+    for method in ['noise', 'oversample', 'synthetic', 'smote', 'all']:
+        with contextlib.redirect_stdout(io.StringIO()):
+            augmented = augment_dataset(df, 'purchased', NUMERICAL_COLS, method)
+        dtypes = augmented[NUMERICAL_COLS].dtypes.astype(str).to_dict()
+        print(f"{method}: {dtypes}")
+        # int32 income next to float32 generated income used to become float64
+        assert 'float64' not in dtypes.values(), method
+        assert augmented['purchased'].dtype == bool
+        if method in ('oversample', 'synthetic', 'smote'):
+            # Original rows come first, unchanged
+            assert (augmented.head(len(df))['income'] == df['income']).all()
+
+if __name__ == "__main__":
+    print("🧪 Testing augmentation dtypes")
+    test_generated_rows_do_not_widen_columns()
+    print("\n✅ Augmentation tests passed!")
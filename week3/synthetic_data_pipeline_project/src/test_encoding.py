@@ -0,0 +1,71 @@
+"""
+Sparse encoder output goes to the models that take it; the rest get a dense frame.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.data_generator import DataGenerator
+from src.encoding import output_for
+from src.model_registry import ModelRegistry
+from src.model_trainer import ModelTrainer, make_incremental_model, make_models
+from src.scoring import BatchScorer
+from src.serving import MicroBatcher
+
+def test_output_for():
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    models = make_models(n_jobs=1)
+    assert output_for(models["random_forest"]) == "sparse"
+    # The centering StandardScaler needs dense input
+    assert output_for(models["logistic_regression"]) == "dense"
+    assert output_for(make_incremental_model()) == "dense"
+    assert output_for(LogisticRegression()) == "sparse"
+    assert output_for(Pipeline([("scaler", StandardScaler(with_mean=False)),
+                                ("clf", LogisticRegression())])) == "sparse"
+    print("✅ output_for picks sparse only where every step takes it")
+
+def test_training_and_scoring_with_sparse_features():
+    raw = DataGenerator(random_seed=5).generate_dataset(400)
+    with tempfile.TemporaryDirectory() as tmp:
+        trainer = ModelTrainer(data=raw, models_dir=tmp, results_dir=tmp)
+        models, _ = trainer.train()
+        # Fitted on the CSR matrix, so the forest recorded no column names
+        assert not hasattr(models["random_forest"], "feature_names_in_")
+        assert hasattr(models["logistic_regression"], "feature_names_in_")
+        trainer.save_models()
+
+        registry = ModelRegistry(tmp)
+        features = raw.drop(columns=["purchased"]).head(50)
+        encoder = registry.load("categorical_encoder", mmap_mode=None)
+        scores = {}
+        for name, model in models.items():
+            scores[name] = BatchScorer(registry.get(name)).score_frame(features)["probability"]
+            X = encoder.transform(features, output=output_for(model))
+            assert np.allclose(scores[name], model.predict_proba(X)[:, 1])
+
+        async def serve_one():
+            batcher = MicroBatcher(registry.get("random_forest"), max_wait_ms=1.0)
+            await batcher.start()
+            try:
+                return await batcher.predict(features.iloc[0].to_dict())
+            finally:
+                await batcher.stop()
+
+        _, probability = asyncio.run(serve_one())
+        assert np.isclose(probability, scores["random_forest"].iloc[0])
+    print("✅ Models trained on sparse features score through BatchScorer and MicroBatcher")
+
+if __name__ == "__main__":
+    print("🧪 Testing encoder output forms")
+    test_output_for()
+    test_training_and_scoring_with_sparse_features()
+    print("\n✅ Encoding tests passed!")
@@ -0,0 +1,53 @@
+"""
+Import-time budget for the package.
+
+Each check runs in a fresh interpreter so nothing is already cached in
+sys.modules. Override the budget with PIPELINE_IMPORT_BUDGET (seconds).
+"""
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_BUDGET_S = float(os.environ.get("PIPELINE_IMPORT_BUDGET", "0.2"))
+HEAVY_MODULES = ["pandas", "matplotlib", "sklearn", "scipy", "joblib"]
+
+def cold_import(statement, repeats=3):
+    """Best-of-n wall time of statement in a new interpreter, plus the heavy modules it loaded."""
+    code = (
+        "import json, sys, time\n"
+        f"sys.path.insert(0, {PROJECT_ROOT!r})\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': elapsed, 'loaded': loaded}))\n"
+    )
+    runs = [json.loads(subprocess.run([sys.executable, "-c", code], check=True,
+                                      capture_output=True, text=True).stdout)
+            for _ in range(repeats)]
+    return min(run["seconds"] for run in runs), runs[0]["loaded"]
+
+def test_import_package_within_budget():
+    seconds, loaded = cold_import("import src")
+    print(f"import src: {seconds * 1000:.1f} ms (budget {IMPORT_BUDGET_S * 1000:.0f} ms)")
+    assert loaded == [], f"import src loaded {loaded}"
+    assert seconds <= IMPORT_BUDGET_S, f"import src took {seconds:.3f}s"
+
+def test_stats_do_not_load_heavy_modules():
+    _, loaded = cold_import("from src import calculate_mean")
+    print(f"from src import calculate_mean loaded: {loaded}")
+    assert loaded == [], f"calculate_mean pulled in {loaded}"
+
+def test_generator_does_not_load_plotting_or_sklearn():
+    _, loaded = cold_import("from src import DataGenerator")
+    print(f"from src import DataGenerator loaded: {loaded}")
+    assert not {"matplotlib", "sklearn"} & set(loaded), f"DataGenerator pulled in {loaded}"
+
+if __name__ == "__main__":
+    print("⏱️ Checking import-time budget")
+    test_import_package_within_budget()
+    test_stats_do_not_load_heavy_modules()
+    test_generator_does_not_load_plotting_or_sklearn()
+    print("\n✅ Import-time budget checks passed!")
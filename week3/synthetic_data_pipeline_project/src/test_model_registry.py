@@ -0,0 +1,77 @@
+"""
+Model registry round trip: versions, metadata, lazy and memory-mapped loading.
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.model_registry import ModelNotFoundError, ModelRegistry
+from src.numpy_inference import export_model
+
+def make_data(n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, 4))
+    return X, (X[:, 0] - X[:, 2] > 0).astype(int)
+
+def test_register_and_load_round_trip():
+    from sklearn.linear_model import LogisticRegression
+
+    X, y = make_data()
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(tmp)
+        first = LogisticRegression().fit(X, y)
+        second = LogisticRegression(C=0.01).fit(X, y)
+        assert registry.register("logreg", first, metrics={"f1": 0.5}, data_hash="abc") == 1
+        assert registry.register("logreg", second, compress=3) == 2
+        assert registry.versions("logreg") == [1, 2]
+        assert registry.names() == ["logreg"]
+
+        metadata = registry.metadata("logreg", 1)
+        assert metadata["metrics"] == {"f1": 0.5} and metadata["data_hash"] == "abc"
+        assert np.array_equal(registry.load("logreg", 1).predict_proba(X), first.predict_proba(X))
+        # Latest version by default; compressed artifacts are read into memory
+        latest = registry.load("logreg")
+        assert np.array_equal(latest.predict_proba(X), second.predict_proba(X))
+        assert not isinstance(latest.coef_, np.memmap)
+        assert isinstance(registry.load("logreg", 1).coef_, np.memmap)
+
+        lazy = registry.get("logreg", 1)
+        assert not lazy.loaded
+        assert np.array_equal(lazy.predict(X), first.predict(X))
+        assert lazy.loaded
+
+        try:
+            registry.load("logreg", 3)
+        except ModelNotFoundError as e:
+            print("Caught:", e)
+        else:
+            raise AssertionError("missing version was loaded")
+    print("✅ Registry round trip works")
+
+def test_forest_sharing_goes_through_the_exported_scorer():
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y = make_data()
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(tmp)
+        registry.register("forest", forest)
+        registry.register("forest_numpy", export_model(forest, keep_forest=False))
+        # sklearn's Tree.__setstate__ copies the node arrays out of the memmap
+        loaded = registry.load("forest")
+        assert not isinstance(loaded.estimators_[0].tree_.value, np.memmap)
+        scorer = registry.load("forest_numpy")
+        assert isinstance(scorer.threshold, np.memmap) and isinstance(scorer.proba, np.memmap)
+        assert np.array_equal(scorer.predict_proba(X), loaded.predict_proba(X))
+    print("✅ Exported forest arrays are memory-mapped")
+
+if __name__ == "__main__":
+    print("🧪 Testing the model registry")
+    test_register_and_load_round_trip()
+    test_forest_sharing_goes_through_the_exported_scorer()
+    print("\n✅ Model registry tests passed!")
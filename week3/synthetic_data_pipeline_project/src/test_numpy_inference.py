@@ -0,0 +1,65 @@
+"""
+Exported NumPy scorers must give sklearn's probabilities.
+"""
+import os
+import sys
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.numpy_inference import SKLEARN_BATCH_SIZE, export_model, max_proba_difference
+
+def make_data(n_rows=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, 5))
+    y = (X[:, 0] + 0.5 * X[:, 1] - X[:, 3] + rng.normal(scale=0.5, size=n_rows) > 0).astype(int)
+    return X, y
+
+def test_forest_scorer_matches_sklearn():
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y = make_data()
+    X[::17, 2] = np.nan  # trained with NaNs, so every split learns missing_go_to_left
+    forest = RandomForestClassifier(n_estimators=25, random_state=0).fit(X, y)
+    scorer = export_model(forest, keep_forest=False)
+    rows = X[:SKLEARN_BATCH_SIZE]
+    print(f"forest difference: {max_proba_difference(forest, scorer, rows):.2e}")
+    assert np.array_equal(scorer.predict_proba(rows), forest.predict_proba(rows))
+    assert np.array_equal(scorer.predict_proba(X[0]), forest.predict_proba(X[:1]))
+
+def test_large_forest_batches_go_to_sklearn():
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y = make_data()
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    scorer = export_model(forest)
+    assert scorer.forest is forest
+    assert np.array_equal(scorer.predict_proba(X), forest.predict_proba(X))
+    # Without the kept forest the NumPy walk scores every batch size
+    arrays_only = export_model(forest, keep_forest=False)
+    assert arrays_only.forest is None
+    assert np.array_equal(arrays_only.predict_proba(X), forest.predict_proba(X))
+
+def test_linear_scorer_matches_sklearn():
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    X, y = make_data()
+    X = X * [1, 1000, 0.01, 5, 1] + [0, 5e4, 0, -3, 0]
+    model = Pipeline([('scaler', StandardScaler()), ('clf', LogisticRegression())]).fit(X, y)
+    scorer = export_model(model)
+    difference = max_proba_difference(model, scorer, X)
+    print(f"logistic difference: {difference:.2e}")
+    # Folding the scaler into the weights reorders the float arithmetic
+    assert difference < 1e-6
+    assert np.array_equal(scorer.predict(X), model.predict(X))
+
+if __name__ == "__main__":
+    print("🧪 Testing exported NumPy scorers")
+    test_forest_scorer_matches_sklearn()
+    test_large_forest_batches_go_to_sklearn()
+    test_linear_scorer_matches_sklearn()
+    print("\n✅ NumPy scorer tests passed!")
@@ -1,77 +1,314 @@
 """
 Visualization helper functions using matplotlib.
+
+Interactive by default. In headless mode (opt-in with set_headless() or
+PIPELINE_HEADLESS=1) figures are drawn with the Agg canvas and saved into
+plots/ instead of calling plt.show().
+
+Histograms are drawn from counts accumulated with np.histogram, and
+scatters above MAX_SCATTER_POINTS become 2D density images, so drawing
+cost does not grow with the number of rows. matplotlib itself is only
+imported when the first figure is drawn.
 """
-import matplotlib.pyplot as plt
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 
-def plot_histogram(data, column_name="Data", bins=20, title=None):
-    """Create histogram for numerical data."""
-    plt.figure(figsize=(8, 6))
-    plt.hist(data, bins=bins, alpha=0.7, edgecolor='black')
-    
-    if title is None:
-        title = f"Histogram of {column_name}"
-    
-    plt.title(title)
-    plt.xlabel(column_name)
-    plt.ylabel('Frequency')
-    plt.grid(True, alpha=0.3)
-    plt.show()
-    print(f"✅ Histogram plotted for {column_name}")
-
-def plot_scatterplot(x_data, y_data, x_label="X", y_label="Y", title=None):
-    """Create scatter plot for two variables."""
-    plt.figure(figsize=(8, 6))
-    plt.scatter(x_data, y_data, alpha=0.6)
-    
-    if title is None:
-        title = f"Scatter Plot: {x_label} vs {y_label}"
-    
-    plt.title(title)
-    plt.xlabel(x_label)
-    plt.ylabel(y_label)
-    plt.grid(True, alpha=0.3)
-    plt.show()
-    print(f"✅ Scatter plot created: {x_label} vs {y_label}")
-
-def plot_multiple_histograms(df, columns, figsize=(12, 8)):
+try:
+    from .paths import PLOTS_DIR
+except ImportError:
+    from paths import PLOTS_DIR
+
+MAX_SCATTER_POINTS = 50000
+
+_render = {
+    'headless': os.environ.get('PIPELINE_HEADLESS', '').lower() in ('1', 'true', 'yes'),
+    'output_dir': PLOTS_DIR,
+    'format': 'png',
+}
+
+def set_headless(enabled=True, output_dir=None, fmt='png'):
+    """Save figures as fmt ('png' or 'svg') into output_dir instead of showing them."""
+    _render['headless'] = enabled
+    _render['output_dir'] = output_dir or PLOTS_DIR
+    _render['format'] = fmt
+
+# Aggregation
+
+def _finite(values):
+    values = np.asarray(values, dtype=float).ravel()
+    return values[np.isfinite(values)]
+
+def _is_chunked(data):
+    return not (hasattr(data, '__array__') or isinstance(data, (list, tuple)))
+
+def histogram_counts(data, bins=20, value_range=None):
+    """Return (counts, edges) for data.
+
+    data is array-like or an iterable of array-like chunks (e.g. one column
+    of storage.iter_frames). Chunks are binned one at a time with
+    np.histogram, which needs value_range=(low, high) up front.
+    """
+    if not _is_chunked(data):
+        values = _finite(data)
+        return np.histogram(values, bins=bins, range=value_range)
+    if value_range is None:
+        raise ValueError("value_range is required when data is an iterable of chunks")
+    edges = np.histogram_bin_edges([], bins=bins, range=value_range)
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    for chunk in data:
+        counts += np.histogram(_finite(chunk), bins=edges)[0]
+    return counts, edges
+
+def density_grid(x_data, y_data=None, bins=100, ranges=None):
+    """Return (grid, x_edges, y_edges), a 2D histogram of point counts.
+
+    Pass x and y arrays, or a single iterable of (x, y) chunks together
+    with ranges=((x_low, x_high), (y_low, y_high)).
+    """
+    if y_data is not None:
+        x, y = np.asarray(x_data, dtype=float).ravel(), np.asarray(y_data, dtype=float).ravel()
+        mask = np.isfinite(x) & np.isfinite(y)
+        return np.histogram2d(x[mask], y[mask], bins=bins, range=ranges)
+    if ranges is None:
+        raise ValueError("ranges is required when data is an iterable of chunks")
+    grid, x_edges, y_edges = np.histogram2d([], [], bins=bins, range=ranges)
+    for x_chunk, y_chunk in x_data:
+        grid += density_grid(x_chunk, y_chunk, bins=(x_edges, y_edges))[0]
+    return grid, x_edges, y_edges
+
+# Drawing onto an existing Axes
+
+def _draw_histogram(ax, counts, edges, column_name, title=None):
+    ax.hist(edges[:-1], bins=edges, weights=counts, alpha=0.7, edgecolor='black')
+    ax.set_title(title or f"Histogram of {column_name}")
+    ax.set_xlabel(column_name)
+    ax.set_ylabel('Frequency')
+    ax.grid(True, alpha=0.3)
+
+def _draw_scatter(ax, x, y, x_label, y_label, title=None):
+    ax.scatter(x, y, alpha=0.6)
+    ax.set_title(title or f"Scatter Plot: {x_label} vs {y_label}")
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    ax.grid(True, alpha=0.3)
+
+def _draw_density(ax, grid, x_edges, y_edges, x_label, y_label, title=None):
+    from matplotlib.colors import LogNorm
+    image = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(grid.T, 0),
+                          cmap='viridis', norm=LogNorm())
+    ax.figure.colorbar(image, ax=ax, label='Count')
+    ax.set_title(title or f"Density: {x_label} vs {y_label}")
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    ax.grid(True, alpha=0.3)
+
+_DRAW = {'histogram': _draw_histogram, 'scatter': _draw_scatter, 'density': _draw_density}
+
+def _scatter_task(x_data, y_data, x_label, y_label, title=None, max_points=MAX_SCATTER_POINTS,
+                  bins=100):
+    """('scatter', kwargs) for small inputs, ('density', kwargs) for large ones."""
+    x, y = np.asarray(x_data), np.asarray(y_data)
+    if len(x) <= max_points:
+        return 'scatter', dict(x=x, y=y, x_label=x_label, y_label=y_label, title=title)
+    grid, x_edges, y_edges = density_grid(x, y, bins=bins)
+    return 'density', dict(grid=grid, x_edges=x_edges, y_edges=y_edges,
+                           x_label=x_label, y_label=y_label, title=title)
+
+# Figure lifecycle
+
+def _new_figure(figsize, nrows=1, ncols=1):
+    """Pyplot figure when interactive; a plain Agg-backed Figure when headless."""
+    if _render['headless']:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=figsize)
+        return fig, fig.subplots(nrows, ncols, squeeze=False).flatten()
+    import matplotlib.pyplot as plt
+    fig, axes = plt.subplots(nrows, ncols, figsize=figsize, squeeze=False)
+    return fig, axes.flatten()
+
+def _plot_path(name, output_dir=None, fmt=None):
+    name = re.sub(r'[^\w.-]+', '_', name).strip('_')
+    output_dir = output_dir or _render['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    return os.path.join(output_dir, f"{name}.{fmt or _render['format']}")
+
+def _finish(fig, name):
+    """Save (headless) or show the figure; returns the saved path or None."""
+    if not _render['headless']:
+        import matplotlib.pyplot as plt
+        plt.show()
+        return None
+    path = _plot_path(name)
+    fig.savefig(path, dpi=100, bbox_inches='tight')
+    return path
+
+def figure_to_png(fig, dpi=100):
+    """Render a matplotlib Figure to PNG bytes."""
+    import io
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+# Public plots
+
+def plot_histogram(data, column_name="Data", bins=20, title=None, value_range=None,
+                   filename=None):
+    """Create histogram for numerical data (array-like or iterable of chunks)."""
+    counts, edges = histogram_counts(data, bins=bins, value_range=value_range)
+    fig, (ax,) = _new_figure((8, 6))
+    _draw_histogram(ax, counts, edges, column_name, title)
+    path = _finish(fig, filename or f"{column_name}_histogram")
+    print(f"✅ Histogram plotted for {column_name}" + (f": {path}" if path else ""))
+    return path
+
+def plot_scatterplot(x_data, y_data, x_label="X", y_label="Y", title=None,
+                     max_points=MAX_SCATTER_POINTS, bins=100, filename=None):
+    """Create scatter plot for two variables; a density image above max_points."""
+    kind, kwargs = _scatter_task(x_data, y_data, x_label, y_label, title, max_points, bins)
+    fig, (ax,) = _new_figure((8, 6))
+    _DRAW[kind](ax, **kwargs)
+    path = _finish(fig, filename or f"{x_label}_{y_label}_scatter")
+    label = "Scatter plot" if kind == 'scatter' else "Density plot"
+    print(f"✅ {label} created: {x_label} vs {y_label}" + (f": {path}" if path else ""))
+    return path
+
+def plot_multiple_histograms(df, columns, figsize=(12, 8), bins=20, filename='histograms'):
     """Plot multiple histograms in subplots."""
     n_cols = len(columns)
     n_rows = (n_cols + 1) // 2
-    
-    fig, axes = plt.subplots(n_rows, 2, figsize=figsize)
-    if n_rows > 1:
-        axes = axes.flatten()
-    elif n_rows == 1:
-        axes = [axes]
-    # else: axes remains as is
-    
-    for i, col in enumerate(columns):
-        if i < len(axes):
-            axes[i].hist(df[col], bins=20, alpha=0.7, edgecolor='black')
-            axes[i].set_title(f'Histogram of {col}')
-            axes[i].set_xlabel(col)
-            axes[i].set_ylabel('Frequency')
-            axes[i].grid(True, alpha=0.3)
-    
+
+    fig, axes = _new_figure(figsize, n_rows, 2)
+    for ax, col in zip(axes, columns):
+        counts, edges = histogram_counts(df[col], bins=bins)
+        _draw_histogram(ax, counts, edges, col)
+
     # Hide empty subplots
-    for j in range(i + 1, len(axes)):
-        axes[j].set_visible(False)
-    
-    plt.tight_layout()
-    plt.show()
+    for ax in axes[n_cols:]:
+        ax.set_visible(False)
+
+    fig.tight_layout()
+    path = _finish(fig, filename)
     print(f"✅ Multiple histograms plotted for {len(columns)} columns")
+    return path
+
+# Parallel headless rendering
+
+def _render_task(task):
+    """Worker: draw one figure on an Agg canvas and save it."""
+    from matplotlib.figure import Figure
+    kind, path, kwargs = task
+    fig = Figure(figsize=(8, 6))
+    _DRAW[kind](fig.add_subplot(), **kwargs)
+    fig.savefig(path, dpi=100, bbox_inches='tight')
+    return path
 
-def quick_data_overview(df, numerical_cols):
+def render_figures(tasks, n_workers=None):
+    """Render independent figures on a process pool.
+
+    tasks is a list of (kind, name, kwargs) with kind in 'histogram',
+    'scatter' or 'density' and kwargs already aggregated (counts, grids),
+    so only small arrays are sent to the workers. Returns the saved paths.
+    """
+    jobs = [(kind, _plot_path(name), kwargs) for kind, name, kwargs in tasks]
+    n_workers = min(n_workers or os.cpu_count() or 1, len(jobs))
+    if n_workers <= 1:
+        return [_render_task(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(_render_task, jobs))
+
+def render_overview(df, numerical_cols, bins=20, n_workers=None):
+    """Save a histogram per numerical column and a scatter/density plot of the
+    first two columns, rendered in parallel. Returns the saved paths."""
+    tasks = []
+    for col in numerical_cols:
+        counts, edges = histogram_counts(df[col], bins=bins)
+        tasks.append(('histogram', f"{col}_histogram",
+                      dict(counts=counts, edges=edges, column_name=col)))
+    if len(numerical_cols) >= 2:
+        col1, col2 = numerical_cols[0], numerical_cols[1]
+        kind, kwargs = _scatter_task(df[col1], df[col2], col1, col2)
+        tasks.append((kind, f"{col1}_{col2}_scatter", kwargs))
+    return render_figures(tasks, n_workers=n_workers)
+
+def quick_data_overview(df, numerical_cols, n_workers=None):
     """Quick visual overview of numerical data."""
     print("📊 Creating quick data overview...")
-    
+
+    if _render['headless']:
+        paths = render_overview(df, numerical_cols, n_workers=n_workers)
+        print(f"✅ Quick overview saved {len(paths)} plots to: {_render['output_dir']}")
+        return paths
+
     # Plot histograms for all numerical columns
     plot_multiple_histograms(df, numerical_cols)
-    
+
     # Create scatter plot matrix for first 3 numerical columns
     if len(numerical_cols) >= 2:
         col1, col2 = numerical_cols[0], numerical_cols[1]
         plot_scatterplot(df[col1], df[col2], col1, col2)
-    
+
     print("✅ Quick overview completed")
+
+def overview_figures(df, numeric_df=None):
+    """Build the standard overview plots without pyplot, so it is safe in threads.
+
+    Returns {file name: PNG bytes} for the age histogram, gender bar plot,
+    age vs income scatter and the correlation heatmap of numeric_df
+    (defaults to the numeric columns of df).
+    """
+    from matplotlib.figure import Figure
+
+    pngs = {}
+
+    fig = Figure(figsize=(8, 6))
+    counts, edges = histogram_counts(df['age'], bins=20)
+    _draw_histogram(fig.add_subplot(), counts, edges, 'age')
+    pngs['age_histogram.png'] = figure_to_png(fig)
+
+    fig = Figure(figsize=(8, 6))
+    ax = fig.add_subplot()
+    counts = df['gender'].value_counts()
+    ax.bar(counts.index.astype(str), counts.values, alpha=0.7, edgecolor='black')
+    ax.set_title('Gender distribution')
+    ax.set_ylabel('Count')
+    pngs['gender_barplot.png'] = figure_to_png(fig)
+
+    fig = Figure(figsize=(8, 6))
+    kind, kwargs = _scatter_task(df['age'], df['income'], 'age', 'income')
+    _DRAW[kind](fig.add_subplot(), **kwargs)
+    pngs['age_income_scatter.png'] = figure_to_png(fig)
+
+    if numeric_df is None:
+        numeric_df = df.select_dtypes(include='number')
+    corr = numeric_df.astype(float).corr()
+    fig = Figure(figsize=(9, 7))
+    ax = fig.add_subplot()
+    image = ax.imshow(corr.values, cmap='coolwarm', vmin=-1, vmax=1)
+    ax.set_xticks(range(len(corr.columns)), corr.columns, rotation=45, ha='right')
+    ax.set_yticks(range(len(corr.columns)), corr.columns)
+    for i in range(len(corr.columns)):
+        for j in range(len(corr.columns)):
+            ax.text(j, i, f"{corr.values[i, j]:.2f}", ha='center', va='center', fontsize=8)
+    fig.colorbar(image, ax=ax)
+    ax.set_title('Correlation heatmap')
+    pngs['correlation_heatmap.png'] = figure_to_png(fig)
+
+    return pngs
+
+if __name__ == "__main__":
+    try:
+        from .paths import PROCESSED_DATA_DIR
+        from .storage import load_frame
+    except ImportError:
+        from paths import PROCESSED_DATA_DIR
+        from storage import load_frame
+
+    set_headless(True)
+    df = load_frame(os.path.join(PROCESSED_DATA_DIR, 'cleaned_data.csv'))
+    for name, png in overview_figures(df).items():
+        with open(_plot_path(os.path.splitext(name)[0], fmt='png'), 'wb') as f:
+            f.write(png)
+    print(f"✅ Overview plots saved to: {PLOTS_DIR}")